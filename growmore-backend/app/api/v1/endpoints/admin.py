@@ -2,6 +2,9 @@
 Admin endpoints for system management and logging.
 These endpoints should be protected in production.
 """
+import asyncio
+import logging
+
 from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from typing import Literal, Optional
 
@@ -9,6 +12,8 @@ from app.logging.service import logging_service
 from app.core.dependencies import get_current_user
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -30,6 +35,11 @@ async def run_manual_sync(
     """
     from app.services.psx import PSXSyncService
 
+    async def _run(name: str, coro):
+        logger.info(f"Manual sync: {name} started")
+        await coro
+        logger.info(f"Manual sync: {name} done")
+
     async def _run_sync():
         sync = PSXSyncService()
         try:
@@ -44,9 +54,14 @@ async def run_manual_sync(
             elif sync_type == "stocks_history":
                 await sync.sync_history_backfill()
             elif sync_type == "all":
-                await sync.sync_full()
-                await sync.sync_history_backfill()
-                await sync.sync_daily_prices()
+                # Daily prices first so every listed company exists; the full
+                # sync and history backfill can then run side by side (their
+                # stock_history writes are upserts on stock_id + date)
+                await _run("daily prices", sync.sync_daily_prices())
+                await asyncio.gather(
+                    _run("full sync", sync.sync_full()),
+                    _run("history backfill", sync.sync_history_backfill()),
+                )
         finally:
             await sync.close()
 
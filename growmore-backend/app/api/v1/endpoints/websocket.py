@@ -174,7 +174,7 @@ async def websocket_prices(
     symbol_list = symbols.split(",") if symbols else []
 
     # Subscribe to prices
-    manager.anonymous_connections.append(websocket)
+    manager.anonymous_connections.add(websocket)
     manager.subscriptions["prices"].add("anonymous")
 
     for symbol in symbol_list:
@@ -202,7 +202,7 @@ async def websocket_prices(
                 await websocket.send_text("pong")
 
     except WebSocketDisconnect:
-        manager.anonymous_connections.remove(websocket)
+        manager.anonymous_connections.discard(websocket)
         manager.subscriptions["prices"].discard("anonymous")
         for symbol in symbol_list:
             if symbol in manager.symbol_subscriptions:
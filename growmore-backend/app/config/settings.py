@@ -18,6 +18,8 @@ class Settings(BaseSettings):
     supabase_url: str = Field(..., env="SUPABASE_URL")
     supabase_key: str = Field(..., env="SUPABASE_KEY")
     supabase_service_key: str = Field(..., env="SUPABASE_SERVICE_KEY")
+    # Optional direct Postgres DSN; enables the asyncpg pool for hot read paths.
+    database_url: Optional[str] = Field(default=None, env="DATABASE_URL")
 
     firebase_project_id: str = Field(..., env="FIREBASE_PROJECT_ID")
     firebase_private_key: str = Field(..., env="FIREBASE_PRIVATE_KEY")
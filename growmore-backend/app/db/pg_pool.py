@@ -0,0 +1,64 @@
+"""
+Optional asyncpg pool for hot read paths.
+
+supabase-py talks to PostgREST over HTTPS, one request per query. When
+DATABASE_URL is set, hot reads can use a pooled direct Postgres connection with
+prepared statements instead. get_pool() returns None when the pool is not
+configured (or asyncpg is missing) so callers fall back to the REST client.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PG_POOL_MIN_SIZE = 10
+PG_POOL_MAX_SIZE = 50
+PG_POOL_MAX_QUERIES = 50000
+PG_POOL_MAX_INACTIVE_LIFETIME = 300  # seconds
+
+_pool = None
+_lock: Optional[asyncio.Lock] = None
+
+
+async def get_pool():
+    """Lazily create the shared pool. Returns None if direct access is disabled."""
+    global _pool, _lock
+    if _pool is not None:
+        return _pool
+    if not settings.database_url:
+        return None
+
+    try:
+        import asyncpg
+    except ImportError:
+        logger.warning("DATABASE_URL is set but asyncpg is not installed")
+        return None
+
+    if _lock is None:
+        _lock = asyncio.Lock()
+
+    async with _lock:
+        if _pool is None:
+            try:
+                _pool = await asyncpg.create_pool(
+                    settings.database_url,
+                    min_size=PG_POOL_MIN_SIZE,
+                    max_size=PG_POOL_MAX_SIZE,
+                    max_queries=PG_POOL_MAX_QUERIES,
+                    max_inactive_connection_lifetime=PG_POOL_MAX_INACTIVE_LIFETIME,
+                )
+                logger.info("Postgres pool created")
+            except Exception as e:
+                logger.error(f"Failed to create Postgres pool: {e}")
+                return None
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -51,6 +51,9 @@ async def lifespan(app: FastAPI):
         except _asyncio.CancelledError:
             pass
 
+    from app.db.pg_pool import close_pool
+    await close_pool()
+
     logger.info(f"Shutting down {settings.app_name}...")
 
 
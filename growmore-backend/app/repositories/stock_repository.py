@@ -4,6 +4,7 @@ from uuid import UUID
 
 from supabase import Client
 
+from app.db.pg_pool import get_pool
 from app.models.stock import Company, Stock, StockHistory
 from app.repositories.base import BaseRepository
 
@@ -30,14 +31,16 @@ class CompanyRepository(BaseRepository[Company]):
 
     async def search_companies(
         self, market_id: UUID, search_term: str, limit: int = 20
-    ) -> List[Company]:
+    ) -> List[Dict[str, Any]]:
+        # Read-only search-as-you-type path: hand the raw rows straight to the
+        # response instead of validating a Company model per hit.
         result = self.client.table(self.table_name).select("*").eq(
             "market_id", str(market_id)
         ).eq("is_active", True).or_(
             f"name.ilike.%{search_term}%,symbol.ilike.%{search_term}%"
         ).limit(limit).execute()
 
-        return [Company(**item) for item in result.data] if result.data else []
+        return result.data or []
 
 
 class StockRepository(BaseRepository[Stock]):
@@ -53,6 +56,33 @@ class StockRepository(BaseRepository[Stock]):
             return Stock(**result.data[0])
         return None
 
+    async def get_by_id_with_company(
+        self,
+        stock_id: UUID,
+        columns: str = "*",
+        company_columns: str = "*",
+    ) -> Optional[Dict[str, Any]]:
+        """Stock row with its company embedded under "company", in one round trip.
+
+        Pass narrower column lists when the caller only needs a few fields
+        (e.g. just the company symbol).
+        """
+        result = self.client.table(self.table_name).select(
+            f"{columns}, company:companies({company_columns})"
+        ).eq("id", str(stock_id)).execute()
+
+        return result.data[0] if result.data else None
+
+    async def get_by_symbol_with_company(
+        self, market_id: UUID, symbol: str
+    ) -> Optional[Dict[str, Any]]:
+        """Stock row for a market/symbol with its company embedded under "company"."""
+        result = self.client.table(self.table_name).select(
+            "*, company:companies!inner(*)"
+        ).eq("company.market_id", str(market_id)).eq("company.symbol", symbol).execute()
+
+        return result.data[0] if result.data else None
+
     async def get_stocks_with_companies(
         self,
         market_id: Optional[UUID] = None,
@@ -91,6 +121,45 @@ class StockRepository(BaseRepository[Stock]):
             "has_previous": page > 1,
         }
 
+    async def _get_movers(
+        self, market_id: UUID, column: str, ascending: bool, limit: int
+    ) -> List[Dict[str, Any]]:
+        """Flattened stock + company rows for a market ordered by column.
+
+        Reads the mv_stock_movers materialized view (scripts/add_stock_movers_view.sql,
+        refreshed after every PSX price sync) through the Postgres pool when
+        configured, else joins via PostgREST.
+        """
+        pool = await get_pool()
+        if pool is not None:
+            direction = "ASC" if ascending else "DESC"
+            rows = await pool.fetch(
+                f"SELECT * FROM mv_stock_movers WHERE market_id = $1"
+                f" ORDER BY {column} {direction} NULLS LAST LIMIT $2",
+                str(market_id), limit,
+            )
+            return [dict(row) for row in rows]
+
+        result = self.client.table(self.table_name).select(
+            "*, companies!inner(market_id, symbol, name, logo_url, is_active)"
+        ).eq("companies.market_id", str(market_id)).eq(
+            "companies.is_active", True
+        ).not_.is_(column, "null").order(column, desc=not ascending).limit(limit).execute()
+
+        rows = result.data or []
+        for row in rows:
+            row.update(row.pop("companies") or {})
+        return rows
+
+    async def get_top_gainers(self, market_id: UUID, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self._get_movers(market_id, "change_percentage", False, limit)
+
+    async def get_top_losers(self, market_id: UUID, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self._get_movers(market_id, "change_percentage", True, limit)
+
+    async def get_most_active(self, market_id: UUID, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self._get_movers(market_id, "volume", False, limit)
+
     async def update_stock_price(
         self, stock_id: UUID, price_data: Dict[str, Any]
     ) -> Optional[Stock]:
@@ -114,6 +183,17 @@ class StockHistoryRepository(BaseRepository[StockHistory]):
         to_date: Optional[date] = None,
         limit: int = 30,
     ) -> List[StockHistory]:
+        pool = await get_pool()
+        if pool is not None:
+            rows = await pool.fetch(
+                "SELECT * FROM stock_history WHERE stock_id = $1"
+                " AND ($2::date IS NULL OR date >= $2)"
+                " AND ($3::date IS NULL OR date <= $3)"
+                " ORDER BY date DESC LIMIT $4",
+                str(stock_id), from_date, to_date, limit,
+            )
+            return [StockHistory(**dict(row)) for row in rows]
+
         query = self.client.table(self.table_name).select("*").eq(
             "stock_id", str(stock_id)
         )
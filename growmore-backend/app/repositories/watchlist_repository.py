@@ -70,6 +70,16 @@ class WatchlistItemRepository(BaseRepository[WatchlistItem]):
             return WatchlistItem(**result.data[0])
         return None
 
+    async def get_item_with_owner(
+        self, item_id: UUID, watchlist_id: UUID
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch an item together with its watchlist's user_id in one query."""
+        result = self.client.table(self.table_name).select(
+            "*, watchlist:watchlists!inner(user_id)"
+        ).eq("id", str(item_id)).eq("watchlist_id", str(watchlist_id)).execute()
+
+        return result.data[0] if result.data else None
+
     async def update_price_alerts(
         self, item_id: UUID, price_alert_above: Optional[float], price_alert_below: Optional[float]
     ) -> Optional[WatchlistItem]:
@@ -36,3 +36,4 @@ DPS_COMPANY_BATCH_DELAY = 1.0      # seconds between DPS batches
 HISTORY_BACKFILL_MONTHS = 24       # default months to backfill (2 years)
 HISTORY_BATCH_SIZE = 5             # concurrent symbol fetches for history
 HISTORY_BATCH_DELAY = 1.0          # seconds between history batches
+HISTORY_MONTH_CONCURRENCY = 4      # concurrent month fetches per symbol
@@ -126,21 +126,40 @@ class PSXDataWriter:
 
     def batch_update_stock_prices(self, rows: List[dict]) -> int:
         """
-        Batch upsert stock prices. Each row must include 'id' (stock_id).
+        Batch upsert stock prices. Each row must include 'id' (stock_id) and
+        'company_id' (NOT NULL, so the upsert's INSERT path is valid).
         Returns count of rows processed.
+
+        A bulk upsert writes NULL for any column a row lacks but another row
+        has, so rows are sent in groups that share the same set of keys.
         """
         if not rows:
             return 0
+        groups: Dict[frozenset, List[dict]] = {}
+        for row in rows:
+            groups.setdefault(frozenset(row), []).append(row)
+
         count = 0
-        for i in range(0, len(rows), BATCH_SIZE):
-            batch = rows[i:i + BATCH_SIZE]
-            try:
-                self.db.table("stocks").upsert(batch, on_conflict="id").execute()
-                count += len(batch)
-            except Exception as e:
-                logger.error(f"Error batch updating stock prices (chunk {i}): {e}")
+        for group in groups.values():
+            for i in range(0, len(group), BATCH_SIZE):
+                batch = group[i:i + BATCH_SIZE]
+                try:
+                    self.db.table("stocks").upsert(batch, on_conflict="id").execute()
+                    count += len(batch)
+                except Exception as e:
+                    logger.error(f"Error batch updating stock prices (chunk {i}): {e}")
+
+        if count:
+            self.refresh_stock_movers()
         return count
 
+    def refresh_stock_movers(self) -> None:
+        """Refresh mv_stock_movers so the top movers lists follow the new prices."""
+        try:
+            self.db.rpc("refresh_stock_movers").execute()
+        except Exception as e:
+            logger.warning(f"Error refreshing stock movers view: {e}")
+
     def batch_upsert_stock_history(self, rows: List[dict]) -> int:
         """
         Batch upsert stock history. Each row must include 'stock_id' and 'date'.
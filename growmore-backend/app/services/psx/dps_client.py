@@ -17,6 +17,7 @@ import httpx
 from bs4 import BeautifulSoup
 
 from app.config.settings import settings
+from .config import HISTORY_MONTH_CONCURRENCY
 from .constants import PSX_SECTOR_CODES, COMPANY_WEBSITES
 
 logger = logging.getLogger(__name__)
@@ -705,17 +706,33 @@ class DPSPortalClient:
         today = date_cls.today()
         start = today - relativedelta(months=months)
 
-        all_rows: List[Dict[str, Any]] = []
+        month_starts = []
         current = date_cls(start.year, start.month, 1)
-
         while current <= today:
-            try:
-                rows = await self._fetch_historical_month(symbol, current.year, current.month)
-                all_rows.extend(rows)
-            except Exception as e:
-                logger.debug(f"Error fetching history for {symbol} {current.year}-{current.month}: {e}")
+            month_starts.append(current)
             current += relativedelta(months=1)
 
+        # Months are independent requests; fetch a few at a time over one client
+        sem = asyncio.Semaphore(HISTORY_MONTH_CONCURRENCY)
+
+        async def fetch_month(client: httpx.AsyncClient, month_start) -> List[Dict[str, Any]]:
+            async with sem:
+                try:
+                    return await self._fetch_historical_month(
+                        client, symbol, month_start.year, month_start.month
+                    )
+                except Exception as e:
+                    logger.debug(f"Error fetching history for {symbol} {month_start.year}-{month_start.month}: {e}")
+                    return []
+
+        async with httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=15.0),
+            verify=False,
+            follow_redirects=True,
+        ) as client:
+            months_rows = await asyncio.gather(*[fetch_month(client, m) for m in month_starts])
+        all_rows = [row for rows in months_rows for row in rows]
+
         # Filter to exact date range and sort
         start_iso = start.isoformat()
         today_iso = today.isoformat()
@@ -727,23 +744,18 @@ class DPSPortalClient:
         return filtered
 
     async def _fetch_historical_month(
-        self, symbol: str, year: int, month: int
+        self, client: httpx.AsyncClient, symbol: str, year: int, month: int
     ) -> List[Dict[str, Any]]:
         """Fetch one month of historical data via POST /historical."""
         rows: List[Dict[str, Any]] = []
         try:
-            async with httpx.AsyncClient(
-                timeout=httpx.Timeout(30.0, connect=15.0),
-                verify=False,
-                follow_redirects=True,
-            ) as client:
-                response = await client.post(
-                    f"{self._base_url}/historical",
-                    data={"month": month, "year": year, "symbol": symbol},
-                    headers=self._headers,
-                )
-                response.raise_for_status()
-                html = response.text
+            response = await client.post(
+                f"{self._base_url}/historical",
+                data={"month": month, "year": year, "symbol": symbol},
+                headers=self._headers,
+            )
+            response.raise_for_status()
+            html = response.text
         except Exception as e:
             logger.debug(f"HTTP error fetching history {symbol} {year}-{month}: {e}")
             return rows
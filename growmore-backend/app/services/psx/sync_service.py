@@ -9,7 +9,7 @@ import logging
 import time
 from dataclasses import dataclass, field
 from datetime import date
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from .client import PSXTerminalClient
 from .config import (
@@ -152,14 +152,7 @@ class PSXSyncService:
             logger.info(f"Fallback tick sync: fetching {len(symbols)} symbols from PSX Terminal")
 
             ticks = await self.psx_client.get_ticks_batch(symbols)
-
-            for symbol, tick in ticks.items():
-                try:
-                    price_data = map_tick_to_stock_update(tick)
-                    if self.data_writer.update_stock_price(symbol, price_data):
-                        result.stocks_updated += 1
-                except Exception as e:
-                    result.errors.append(f"{symbol}: {e}")
+            self._write_tick_prices(ticks, result)
 
         except Exception as e:
             result.errors.append(f"Fallback tick sync failed: {e}")
@@ -167,6 +160,22 @@ class PSXSyncService:
 
         return result
 
+    def _write_tick_prices(self, ticks: Dict[str, dict], result: SyncResult) -> None:
+        """Map symbol → tick payloads to stock updates and write them in one batch."""
+        price_updates = []
+        for symbol, tick in ticks.items():
+            ids = self.data_writer.get_ids(symbol)
+            if not ids:
+                continue
+            company_id, stock_id = ids
+            try:
+                price_data = map_tick_to_stock_update(tick)
+                price_updates.append({**price_data, "id": stock_id, "company_id": company_id})
+            except Exception as e:
+                result.errors.append(f"{symbol}: {e}")
+
+        result.stocks_updated += self.data_writer.batch_update_stock_prices(price_updates)
+
     # ─── Weekly Full Sync (replaces scrape_full) ───
 
     async def sync_full(self) -> SyncResult:
@@ -516,17 +525,9 @@ class PSXSyncService:
                 movers.extend(stats.get(key, []))
 
             result.symbols_found = len(movers)
-
-            for mover in movers:
-                symbol = mover.get("symbol")
-                if not symbol:
-                    continue
-                try:
-                    tick_data = map_tick_to_stock_update(mover)
-                    if self.data_writer.update_stock_price(symbol, tick_data):
-                        result.stocks_updated += 1
-                except Exception as e:
-                    result.errors.append(f"{symbol}: {e}")
+            self._write_tick_prices(
+                {mover["symbol"]: mover for mover in movers if mover.get("symbol")}, result
+            )
 
         except Exception as e:
             # PSX Terminal stats endpoint is unavailable — fall back to DPS
@@ -38,9 +38,9 @@ class SearchService:
             companies = await self.company_repo.search_companies(market_id, query, limit)
             results["stocks"] = [
                 {
-                    "id": str(c.id),
-                    "symbol": c.symbol,
-                    "name": c.name,
+                    "id": c["id"],
+                    "symbol": c["symbol"],
+                    "name": c["name"],
                     "type": "stock",
                 }
                 for c in companies
@@ -1,5 +1,8 @@
+import math
+import time
 from datetime import date, timedelta
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from supabase import Client
@@ -7,7 +10,97 @@ from supabase import Client
 from app.models.stock import Company, Stock, StockHistory
 from app.repositories.stock_repository import CompanyRepository, StockRepository, StockHistoryRepository
 from app.core.exceptions import NotFoundError
-from app.schemas.stock import StockRatingsResponse, RatingMetric
+from app.utils.constants import TIME_PERIODS
+
+# Stock lookups are read on every chart load and watchlist render. Company
+# metadata rarely changes, so it is kept briefly in-process; the stock row
+# itself is always re-read so prices stay live.
+STOCK_TTL = 60  # seconds
+STOCK_CACHE_MAX = 5000
+_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def _get_cached(key: str) -> Optional[Any]:
+    entry = _cache.get(key)
+    if entry and (time.time() - entry["ts"]) < STOCK_TTL:
+        return entry["data"]
+    return None
+
+
+def _set_cached(key: str, data: Any) -> None:
+    if len(_cache) >= STOCK_CACHE_MAX:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = {"data": data, "ts": time.time()}
+
+
+_PERIOD_DELTAS = MappingProxyType({p: timedelta(days=d) for p, d in TIME_PERIODS.items()})
+_DEFAULT_DELTA = timedelta(days=30)
+
+
+def _safe_float(val) -> Optional[float]:
+    if val is None:
+        return None
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return None
+
+
+def _fmt_pct(v: Optional[float]) -> str:
+    return f"{v:.1f}%" if v is not None else "N/A"
+
+
+def _fmt_ratio(v: Optional[float]) -> str:
+    return f"{v:.2f}" if v is not None else "N/A"
+
+
+def _fmt_val(v: Optional[float]) -> str:
+    if v is None:
+        return "N/A"
+    if abs(v) >= 1e9:
+        return f"Rs. {v/1e9:.1f}B"
+    if abs(v) >= 1e7:
+        return f"Rs. {v/1e7:.1f}Cr"
+    if abs(v) >= 1e5:
+        return f"Rs. {v/1e5:.1f}L"
+    return f"Rs. {v:,.0f}"
+
+
+def _rate(v: Optional[float], low: float, high: float) -> str:
+    if v is None:
+        return "neutral"
+    return "good" if low < v < high else "bad"
+
+
+def _fmt_multiple(v: Optional[float]) -> str:
+    return f"{_fmt_ratio(v)}x"
+
+
+_INF = math.inf
+
+# (name, category, stock field, formatter, low, high) per rating metric; a value
+# rates "good" when it lies strictly between low and high.
+_METRICS: List[Tuple[str, str, str, Callable[[Optional[float]], str], float, float]] = [
+    ("Revenue Growth", "growth", "revenue_growth", _fmt_pct, 0, _INF),
+    ("Operating Profit Growth", "growth", "profit_growth", _fmt_pct, 0, _INF),
+    ("Net Profit Growth", "growth", "earnings_growth", _fmt_pct, 0, _INF),
+    ("EPS Growth Trend", "growth", "earnings_growth", _fmt_pct, 5, _INF),
+    ("Operating Profit Margin", "stability", "operating_margin", _fmt_pct, 10, _INF),
+    ("Net Profit Margin", "stability", "net_margin", _fmt_pct, 5, _INF),
+    ("Debt to Equity", "stability", "debt_to_equity", _fmt_ratio, -_INF, 1),
+    ("Current Ratio", "stability", "current_ratio", _fmt_ratio, 1.5, _INF),
+    ("Return on Equity (ROE)", "stability", "roe", _fmt_pct, 15, _INF),
+    ("Price to Earnings (P/E)", "valuation", "pe_ratio", _fmt_multiple, 0, 25),
+    ("Price to Book (P/B)", "valuation", "pb_ratio", _fmt_ratio, 0, 3),
+    ("Price to Sales (P/S)", "valuation", "ps_ratio", _fmt_ratio, 0, 2),
+    ("Dividend Yield", "valuation", "dividend_yield", _fmt_pct, 3, _INF),
+    ("EV/EBITDA", "valuation", "ev_ebitda", _fmt_multiple, 0, 15),
+    ("Return on Assets (ROA)", "efficiency", "roa", _fmt_pct, 5, _INF),
+    ("Gross Margin", "efficiency", "gross_margin", _fmt_pct, 20, _INF),
+    ("Free Cash Flow", "cash_flow", "free_cash_flow", _fmt_val, 0, _INF),
+    ("Operating Cash Flow", "cash_flow", "operating_cash_flow", _fmt_val, 0, _INF),
+    ("FCF Yield", "cash_flow", "fcf_yield", _fmt_pct, 5, _INF),
+]
 
 
 class StockService:
@@ -36,31 +129,42 @@ class StockService:
         )
 
     async def get_stock_by_id(self, stock_id: UUID) -> Dict[str, Any]:
-        stock = await self.stock_repo.get_by_id(stock_id)
-        if not stock:
+        cache_key = f"company:{stock_id}"
+        company = _get_cached(cache_key)
+        if company is not None:
+            row = await self.stock_repo.get_by_id(stock_id)
+            if not row:
+                raise NotFoundError("Stock")
+            return {**row, "company": dict(company)}
+
+        result = await self.stock_repo.get_by_id_with_company(stock_id)
+        if not result:
             raise NotFoundError("Stock")
 
-        company = await self.company_repo.get_by_id(stock["company_id"])
-        if not company:
+        if not result.get("company"):
             raise NotFoundError("Company")
 
-        return {
-            **stock,
-            "company": company,
-        }
+        _set_cached(cache_key, dict(result["company"]))
+        return result
 
     async def get_stock_by_symbol(self, market_id: UUID, symbol: str) -> Dict[str, Any]:
-        company = await self.company_repo.get_by_symbol(market_id, symbol)
-        if not company:
-            raise NotFoundError("Company")
-
-        stock = await self.stock_repo.get_by_company(company.id)
-        if not stock:
+        cache_key = f"symbol:{market_id}:{symbol}"
+        cached = _get_cached(cache_key)
+        if cached is not None:
+            stock_id, company = cached
+            row = await self.stock_repo.get_by_id(stock_id)
+        else:
+            row = await self.stock_repo.get_by_symbol_with_company(market_id, symbol)
+            if row:
+                company = row.pop("company")
+                _set_cached(cache_key, (row["id"], dict(company)))
+
+        if not row:
             raise NotFoundError("Stock")
 
         return {
-            "stock": stock,
-            "company": company,
+            "stock": Stock(**row),
+            "company": Company(**company),
         }
 
     async def get_stock_history(
@@ -73,24 +177,14 @@ class StockService:
             raise NotFoundError("Stock")
 
         to_date = date.today()
-        period_days = {
-            "1W": 7,
-            "1M": 30,
-            "3M": 90,
-            "6M": 180,
-            "1Y": 365,
-            "2Y": 730,
-            "3Y": 1095,
-            "5Y": 1825,
-        }
-        days = period_days.get(period, 30)
-        from_date = to_date - timedelta(days=days)
+        delta = _PERIOD_DELTAS.get(period, _DEFAULT_DELTA)
+        from_date = to_date - delta
 
         history = await self.history_repo.get_history(
             stock_id=stock_id,
             from_date=from_date,
             to_date=to_date,
-            limit=days,
+            limit=delta.days,
         )
 
         return {
@@ -101,7 +195,7 @@ class StockService:
 
     async def search_stocks(
         self, market_id: UUID, search_term: str, limit: int = 20
-    ) -> List[Company]:
+    ) -> List[Dict[str, Any]]:
         return await self.company_repo.search_companies(market_id, search_term, limit)
 
     async def update_stock_price(
@@ -116,16 +210,18 @@ class StockService:
         limit: int = 5,
     ) -> Dict[str, Any]:
         """Get financial statements for a stock."""
-        stock = await self.stock_repo.get_by_id(stock_id)
+        stock = await self.stock_repo.get_by_id_with_company(
+            stock_id, columns="id, company_id", company_columns="symbol"
+        )
         if not stock:
             raise NotFoundError("Stock")
 
-        company = await self.company_repo.get_by_id(stock["company_id"])
+        company = stock.get("company")
         if not company:
             raise NotFoundError("Company")
 
         company_id = stock["company_id"]
-        symbol = company.symbol if hasattr(company, 'symbol') else company.get("symbol", "")
+        symbol = company.get("symbol", "")
 
         try:
             result = self.db.table("financial_statements").select("*").eq(
@@ -145,15 +241,17 @@ class StockService:
 
     async def get_activities(self, stock_id: UUID) -> Dict[str, Any]:
         """Company activities (announcements) scraped on demand from DPS PSX."""
-        stock = await self.stock_repo.get_by_id(stock_id)
+        stock = await self.stock_repo.get_by_id_with_company(
+            stock_id, columns="id", company_columns="symbol"
+        )
         if not stock:
             raise NotFoundError("Stock")
 
-        company = await self.company_repo.get_by_id(stock["company_id"])
+        company = stock.get("company")
         if not company:
             raise NotFoundError("Company")
 
-        symbol = company.symbol if hasattr(company, "symbol") else company.get("symbol", "")
+        symbol = company.get("symbol", "")
 
         activities: List[Dict[str, Any]] = []
         if symbol:
@@ -169,148 +267,44 @@ class StockService:
             "activities": activities,
         }
 
-    async def get_ratings(self, stock_id: UUID) -> StockRatingsResponse:
-        """Compute Good/Bad ratings for a stock based on its metrics."""
-        stock_data = await self.stock_repo.get_by_id(stock_id)
+    async def get_ratings(self, stock_id: UUID) -> Dict[str, Any]:
+        """Compute Good/Bad ratings for a stock based on its metrics.
+
+        Returns plain dicts shaped like StockRatingsResponse; the endpoint's
+        response_model validates them once on the way out.
+        """
+        stock_data = await self.stock_repo.get_by_id_with_company(
+            stock_id, company_columns="symbol"
+        )
         if not stock_data:
             raise NotFoundError("Stock")
 
-        company = await self.company_repo.get_by_id(stock_data["company_id"])
-        symbol = company.symbol if hasattr(company, 'symbol') else company.get("symbol", "")
+        symbol = (stock_data.get("company") or {}).get("symbol", "")
 
-        def safe_float(val) -> Optional[float]:
-            if val is None:
-                return None
-            try:
-                return float(val)
-            except (ValueError, TypeError):
-                return None
-
-        def fmt_pct(val) -> str:
-            v = safe_float(val)
-            return f"{v:.1f}%" if v is not None else "N/A"
-
-        def fmt_ratio(val) -> str:
-            v = safe_float(val)
-            return f"{v:.2f}" if v is not None else "N/A"
-
-        def fmt_val(val) -> str:
-            v = safe_float(val)
-            if v is None:
-                return "N/A"
-            if abs(v) >= 1e9:
-                return f"Rs. {v/1e9:.1f}B"
-            if abs(v) >= 1e7:
-                return f"Rs. {v/1e7:.1f}Cr"
-            if abs(v) >= 1e5:
-                return f"Rs. {v/1e5:.1f}L"
-            return f"Rs. {v:,.0f}"
-
-        def rate(val, good_fn) -> str:
-            v = safe_float(val)
-            if v is None:
-                return "neutral"
-            return "good" if good_fn(v) else "bad"
-
-        growth_metrics = [
-            RatingMetric(name="Revenue Growth", category="growth",
-                         value=str(safe_float(stock_data.get("revenue_growth")) or ""),
-                         display_value=fmt_pct(stock_data.get("revenue_growth")),
-                         status=rate(stock_data.get("revenue_growth"), lambda v: v > 0)),
-            RatingMetric(name="Operating Profit Growth", category="growth",
-                         value=str(safe_float(stock_data.get("profit_growth")) or ""),
-                         display_value=fmt_pct(stock_data.get("profit_growth")),
-                         status=rate(stock_data.get("profit_growth"), lambda v: v > 0)),
-            RatingMetric(name="Net Profit Growth", category="growth",
-                         value=str(safe_float(stock_data.get("earnings_growth")) or ""),
-                         display_value=fmt_pct(stock_data.get("earnings_growth")),
-                         status=rate(stock_data.get("earnings_growth"), lambda v: v > 0)),
-            RatingMetric(name="EPS Growth Trend", category="growth",
-                         value=str(safe_float(stock_data.get("earnings_growth")) or ""),
-                         display_value=fmt_pct(stock_data.get("earnings_growth")),
-                         status=rate(stock_data.get("earnings_growth"), lambda v: v > 5)),
-        ]
-
-        stability_metrics = [
-            RatingMetric(name="Operating Profit Margin", category="stability",
-                         value=str(safe_float(stock_data.get("operating_margin")) or ""),
-                         display_value=fmt_pct(stock_data.get("operating_margin")),
-                         status=rate(stock_data.get("operating_margin"), lambda v: v > 10)),
-            RatingMetric(name="Net Profit Margin", category="stability",
-                         value=str(safe_float(stock_data.get("net_margin")) or ""),
-                         display_value=fmt_pct(stock_data.get("net_margin")),
-                         status=rate(stock_data.get("net_margin"), lambda v: v > 5)),
-            RatingMetric(name="Debt to Equity", category="stability",
-                         value=str(safe_float(stock_data.get("debt_to_equity")) or ""),
-                         display_value=fmt_ratio(stock_data.get("debt_to_equity")),
-                         status=rate(stock_data.get("debt_to_equity"), lambda v: v < 1)),
-            RatingMetric(name="Current Ratio", category="stability",
-                         value=str(safe_float(stock_data.get("current_ratio")) or ""),
-                         display_value=fmt_ratio(stock_data.get("current_ratio")),
-                         status=rate(stock_data.get("current_ratio"), lambda v: v > 1.5)),
-            RatingMetric(name="Return on Equity (ROE)", category="stability",
-                         value=str(safe_float(stock_data.get("roe")) or ""),
-                         display_value=fmt_pct(stock_data.get("roe")),
-                         status=rate(stock_data.get("roe"), lambda v: v > 15)),
-        ]
-
-        valuation_metrics = [
-            RatingMetric(name="Price to Earnings (P/E)", category="valuation",
-                         value=str(safe_float(stock_data.get("pe_ratio")) or ""),
-                         display_value=f"{fmt_ratio(stock_data.get('pe_ratio'))}x",
-                         status=rate(stock_data.get("pe_ratio"), lambda v: 0 < v < 25)),
-            RatingMetric(name="Price to Book (P/B)", category="valuation",
-                         value=str(safe_float(stock_data.get("pb_ratio")) or ""),
-                         display_value=fmt_ratio(stock_data.get("pb_ratio")),
-                         status=rate(stock_data.get("pb_ratio"), lambda v: 0 < v < 3)),
-            RatingMetric(name="Price to Sales (P/S)", category="valuation",
-                         value=str(safe_float(stock_data.get("ps_ratio")) or ""),
-                         display_value=fmt_ratio(stock_data.get("ps_ratio")),
-                         status=rate(stock_data.get("ps_ratio"), lambda v: 0 < v < 2)),
-            RatingMetric(name="Dividend Yield", category="valuation",
-                         value=str(safe_float(stock_data.get("dividend_yield")) or ""),
-                         display_value=fmt_pct(stock_data.get("dividend_yield")),
-                         status=rate(stock_data.get("dividend_yield"), lambda v: v > 3)),
-            RatingMetric(name="EV/EBITDA", category="valuation",
-                         value=str(safe_float(stock_data.get("ev_ebitda")) or ""),
-                         display_value=f"{fmt_ratio(stock_data.get('ev_ebitda'))}x",
-                         status=rate(stock_data.get("ev_ebitda"), lambda v: 0 < v < 15)),
-        ]
-
-        efficiency_metrics = [
-            RatingMetric(name="Return on Assets (ROA)", category="efficiency",
-                         value=str(safe_float(stock_data.get("roa")) or ""),
-                         display_value=fmt_pct(stock_data.get("roa")),
-                         status=rate(stock_data.get("roa"), lambda v: v > 5)),
-            RatingMetric(name="Gross Margin", category="efficiency",
-                         value=str(safe_float(stock_data.get("gross_margin")) or ""),
-                         display_value=fmt_pct(stock_data.get("gross_margin")),
-                         status=rate(stock_data.get("gross_margin"), lambda v: v > 20)),
-        ]
-
-        fcf = safe_float(stock_data.get("free_cash_flow"))
-        ocf = safe_float(stock_data.get("operating_cash_flow"))
-        cash_flow_metrics = [
-            RatingMetric(name="Free Cash Flow", category="cash_flow",
-                         value=str(fcf or ""),
-                         display_value=fmt_val(fcf),
-                         status="good" if fcf and fcf > 0 else ("bad" if fcf is not None else "neutral")),
-            RatingMetric(name="Operating Cash Flow", category="cash_flow",
-                         value=str(ocf or ""),
-                         display_value=fmt_val(ocf),
-                         status="good" if ocf and ocf > 0 else ("bad" if ocf is not None else "neutral")),
-            RatingMetric(name="FCF Yield", category="cash_flow",
-                         value=str(safe_float(stock_data.get("fcf_yield")) or ""),
-                         display_value=fmt_pct(stock_data.get("fcf_yield")),
-                         status=rate(stock_data.get("fcf_yield"), lambda v: v > 5)),
-        ]
-
-        return StockRatingsResponse(
-            stock_id=stock_id,
-            symbol=symbol,
-            growth_metrics=growth_metrics,
-            stability_metrics=stability_metrics,
-            valuation_metrics=valuation_metrics,
-            efficiency_metrics=efficiency_metrics,
-            cash_flow_metrics=cash_flow_metrics,
-        )
+        metrics_by_cat: Dict[str, List[Dict[str, Any]]] = {
+            "growth": [],
+            "stability": [],
+            "valuation": [],
+            "efficiency": [],
+            "cash_flow": [],
+        }
+        for name, category, key, fmt, low, high in _METRICS:
+            # Parse each field once; the formatter and threshold check share the float.
+            v = _safe_float(stock_data.get(key))
+            metrics_by_cat[category].append({
+                "name": name,
+                "category": category,
+                "value": "" if v is None else repr(v),
+                "display_value": fmt(v),
+                "status": _rate(v, low, high),
+            })
+
+        return {
+            "stock_id": stock_id,
+            "symbol": symbol,
+            "growth_metrics": metrics_by_cat["growth"],
+            "stability_metrics": metrics_by_cat["stability"],
+            "valuation_metrics": metrics_by_cat["valuation"],
+            "efficiency_metrics": metrics_by_cat["efficiency"],
+            "cash_flow_metrics": metrics_by_cat["cash_flow"],
+        }
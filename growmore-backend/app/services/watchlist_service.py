@@ -1,17 +1,54 @@
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from supabase import Client
 
-from app.models.watchlist import Watchlist, WatchlistItem
+from app.models.watchlist import Watchlist, WatchlistItem, UserAlert
 from app.repositories.watchlist_repository import (
     WatchlistRepository,
     WatchlistItemRepository,
     UserAlertRepository,
 )
 from app.core.exceptions import NotFoundError, AuthorizationError, ConflictError
+from app.utils.constants import CACHE_TTL
+
+# Watchlist lists are read on most dashboard loads but only change through
+# this service, so cache them per user and drop the entry on every write.
+WATCHLIST_TTL = CACHE_TTL["user_profile"]
+WATCHLIST_CACHE_MAX = 10000
+_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def _get_cached(user_id: UUID) -> Optional[List[Dict[str, Any]]]:
+    entry = _cache.get(str(user_id))
+    if entry and (time.time() - entry["ts"]) < WATCHLIST_TTL:
+        return entry["data"]
+    return None
+
+
+def _set_cached(user_id: UUID, data: List[Dict[str, Any]]) -> None:
+    if len(_cache) >= WATCHLIST_CACHE_MAX:
+        _cache.pop(next(iter(_cache)))
+    _cache[str(user_id)] = {"data": data, "ts": time.time()}
+
+
+def _invalidate(user_id: UUID) -> None:
+    _cache.pop(str(user_id), None)
+
+
+def _authorize(watchlist: Optional[Dict[str, Any]], user_id: UUID, action: str) -> None:
+    """Raise unless the watchlist exists and belongs to user_id."""
+    if not watchlist:
+        raise NotFoundError("Watchlist")
+
+    owner_id = watchlist["user_id"]
+    if not isinstance(owner_id, UUID):
+        owner_id = UUID(owner_id)
+    if owner_id != user_id:
+        raise AuthorizationError(f"Not authorized to {action} this watchlist")
 
 
 class WatchlistService:
@@ -21,15 +58,17 @@ class WatchlistService:
         self.alert_repo = UserAlertRepository(db)
 
     async def get_user_watchlists(self, user_id: UUID) -> List[Dict[str, Any]]:
-        return await self.watchlist_repo.get_user_watchlists(user_id)
+        cached = _get_cached(user_id)
+        if cached is not None:
+            return cached
+
+        watchlists = await self.watchlist_repo.get_user_watchlists(user_id)
+        _set_cached(user_id, watchlists)
+        return watchlists
 
     async def get_watchlist_by_id(self, watchlist_id: UUID, user_id: UUID) -> Dict[str, Any]:
         watchlist = await self.watchlist_repo.get_by_id(watchlist_id)
-        if not watchlist:
-            raise NotFoundError("Watchlist")
-
-        if str(watchlist["user_id"]) != str(user_id):
-            raise AuthorizationError("Not authorized to access this watchlist")
+        _authorize(watchlist, user_id, "access")
 
         items = await self.item_repo.get_watchlist_items(watchlist_id)
 
@@ -49,45 +88,37 @@ class WatchlistService:
 
         data["user_id"] = str(user_id)
         result = await self.watchlist_repo.create(data)
+        _invalidate(user_id)
         return Watchlist(**result)
 
     async def update_watchlist(
         self, watchlist_id: UUID, user_id: UUID, data: Dict[str, Any]
     ) -> Watchlist:
         watchlist = await self.watchlist_repo.get_by_id(watchlist_id)
-        if not watchlist:
-            raise NotFoundError("Watchlist")
-
-        if str(watchlist["user_id"]) != str(user_id):
-            raise AuthorizationError("Not authorized to update this watchlist")
+        _authorize(watchlist, user_id, "update")
 
         if data.get("is_default", False):
             await self.watchlist_repo.set_default(user_id, watchlist_id)
             data.pop("is_default", None)
 
-        data["updated_at"] = datetime.utcnow().isoformat()
+        data["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
         result = await self.watchlist_repo.update(watchlist_id, data)
+        _invalidate(user_id)
         return Watchlist(**result)
 
     async def delete_watchlist(self, watchlist_id: UUID, user_id: UUID) -> bool:
         watchlist = await self.watchlist_repo.get_by_id(watchlist_id)
-        if not watchlist:
-            raise NotFoundError("Watchlist")
+        _authorize(watchlist, user_id, "delete")
 
-        if str(watchlist["user_id"]) != str(user_id):
-            raise AuthorizationError("Not authorized to delete this watchlist")
-
-        return await self.watchlist_repo.delete(watchlist_id)
+        deleted = await self.watchlist_repo.delete(watchlist_id)
+        _invalidate(user_id)
+        return deleted
 
     async def add_item(
         self, watchlist_id: UUID, user_id: UUID, data: Dict[str, Any]
     ) -> WatchlistItem:
         watchlist = await self.watchlist_repo.get_by_id(watchlist_id)
-        if not watchlist:
-            raise NotFoundError("Watchlist")
-
-        if str(watchlist["user_id"]) != str(user_id):
-            raise AuthorizationError("Not authorized to modify this watchlist")
+        _authorize(watchlist, user_id, "modify")
 
         existing = await self.item_repo.get_item_by_asset(
             watchlist_id, data["item_type"], data["item_id"]
@@ -104,23 +135,20 @@ class WatchlistService:
             data["price_alert_below"] = float(data["price_alert_below"])
 
         result = await self.item_repo.create(data)
+        _invalidate(user_id)  # cached lists carry item counts
         return WatchlistItem(**result)
 
     async def remove_item(
         self, watchlist_id: UUID, item_id: UUID, user_id: UUID
     ) -> bool:
-        watchlist = await self.watchlist_repo.get_by_id(watchlist_id)
-        if not watchlist:
-            raise NotFoundError("Watchlist")
-
-        if str(watchlist["user_id"]) != str(user_id):
-            raise AuthorizationError("Not authorized to modify this watchlist")
-
-        item = await self.item_repo.get_by_id(item_id)
-        if not item or str(item["watchlist_id"]) != str(watchlist_id):
+        item = await self.item_repo.get_item_with_owner(item_id, watchlist_id)
+        if not item:
             raise NotFoundError("Watchlist Item")
+        _authorize(item["watchlist"], user_id, "modify")
 
-        return await self.item_repo.delete(item_id)
+        deleted = await self.item_repo.delete(item_id)
+        _invalidate(user_id)
+        return deleted
 
     async def update_price_alerts(
         self,
@@ -130,16 +158,10 @@ class WatchlistService:
         price_alert_above: Optional[Decimal] = None,
         price_alert_below: Optional[Decimal] = None,
     ) -> WatchlistItem:
-        watchlist = await self.watchlist_repo.get_by_id(watchlist_id)
-        if not watchlist:
-            raise NotFoundError("Watchlist")
-
-        if str(watchlist["user_id"]) != str(user_id):
-            raise AuthorizationError("Not authorized to modify this watchlist")
-
-        item = await self.item_repo.get_by_id(item_id)
-        if not item or str(item["watchlist_id"]) != str(watchlist_id):
+        item = await self.item_repo.get_item_with_owner(item_id, watchlist_id)
+        if not item:
             raise NotFoundError("Watchlist Item")
+        _authorize(item["watchlist"], user_id, "modify")
 
         result = await self.item_repo.update_price_alerts(
             item_id,
@@ -152,6 +174,5 @@ class WatchlistService:
 
         return result
 
-    async def get_user_alerts(self, user_id: UUID, active_only: bool = True) -> List[Dict[str, Any]]:
-        alerts = await self.alert_repo.get_user_alerts(user_id, active_only)
-        return [alert.model_dump() for alert in alerts]
+    async def get_user_alerts(self, user_id: UUID, active_only: bool = True) -> List[UserAlert]:
+        return await self.alert_repo.get_user_alerts(user_id, active_only)
@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 HOLDING_TYPES = ["stock", "commodity"]
 
 TRANSACTION_TYPES = ["buy", "sell"]
@@ -79,30 +81,32 @@ PSX_SECTORS = [
     "Woollen",
 ]
 
-TIME_PERIODS = {
+TIME_PERIODS = MappingProxyType({
     "1W": 7,
     "1M": 30,
     "3M": 90,
     "6M": 180,
     "1Y": 365,
+    "2Y": 730,
+    "3Y": 1095,
     "5Y": 1825,
-}
+})
 
-API_RATE_LIMITS = {
+API_RATE_LIMITS = MappingProxyType({
     "default": 60,
     "authenticated": 120,
     "premium": 300,
-}
+})
 
-CACHE_TTL = {
+CACHE_TTL = MappingProxyType({
     "stock_prices": 300,
     "commodity_prices": 300,
     "news_list": 180,
     "market_overview": 600,
     "user_profile": 3600,
-}
+})
 
-ERROR_MESSAGES = {
+ERROR_MESSAGES = MappingProxyType({
     "unauthorized": "Authentication required",
     "forbidden": "You don't have permission to perform this action",
     "not_found": "Resource not found",
@@ -110,4 +114,4 @@ ERROR_MESSAGES = {
     "internal_error": "An unexpected error occurred",
     "rate_limit": "Too many requests. Please try again later",
     "service_unavailable": "Service temporarily unavailable",
-}
+})
@@ -1,5 +1,21 @@
+from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional, Union
+from functools import lru_cache
+from typing import Iterable, List, Optional, Union
+
+# Suffix thresholds for format_number, largest first.
+_THRESHOLDS = (
+    (1_000_000_000_000, "T"),
+    (1_000_000_000, "B"),
+    (1_000_000, "M"),
+    (1_000, "K"),
+)
+
+
+@lru_cache(maxsize=32)
+def _spec(decimal_places: int, suffix: str) -> str:
+    """Format string for a fixed number of decimals plus suffix, built once per pair."""
+    return f"{{:.{decimal_places}f}}{suffix}"
 
 
 def format_currency(
@@ -38,15 +54,8 @@ def format_percentage(
     except (ValueError, TypeError):
         return ""
 
-    formatted = f"{abs(value):.{decimal_places}f}%"
-
-    if include_sign:
-        if value > 0:
-            return f"+{formatted}"
-        elif value < 0:
-            return f"-{formatted}"
-
-    return formatted
+    sign = ("+" if value > 0 else "-" if value < 0 else "") if include_sign else ""
+    return f"{sign}{abs(value):.{decimal_places}f}%"
 
 
 def format_number(
@@ -63,18 +72,42 @@ def format_number(
         return ""
 
     if use_suffix:
-        if abs(value) >= 1_000_000_000_000:
-            return f"{value / 1_000_000_000_000:.{decimal_places}f}T"
-        elif abs(value) >= 1_000_000_000:
-            return f"{value / 1_000_000_000:.{decimal_places}f}B"
-        elif abs(value) >= 1_000_000:
-            return f"{value / 1_000_000:.{decimal_places}f}M"
-        elif abs(value) >= 1_000:
-            return f"{value / 1_000:.{decimal_places}f}K"
+        magnitude = abs(value)
+        for threshold, suffix in _THRESHOLDS:
+            if magnitude >= threshold:
+                return _spec(decimal_places, suffix).format(value / threshold)
 
     return f"{value:,.{decimal_places}f}"
 
 
+def format_number_batch(
+    values: Iterable[Union[float, Decimal, int, None]],
+    decimal_places: int = 2,
+) -> List[str]:
+    """format_number over a whole column, resolving the format specs once per call."""
+    plain = f"{{:,.{decimal_places}f}}".format
+    scaled = [(threshold, _spec(decimal_places, suffix).format) for threshold, suffix in _THRESHOLDS]
+
+    out: List[str] = []
+    append = out.append
+    for value in values:
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            append("")
+            continue
+
+        magnitude = abs(value)
+        for threshold, fmt in scaled:
+            if magnitude >= threshold:
+                append(fmt(value / threshold))
+                break
+        else:
+            append(plain(value))
+
+    return out
+
+
 def format_volume(volume: int) -> str:
     if volume is None:
         return ""
@@ -91,7 +124,15 @@ def format_market_cap(market_cap: Union[float, Decimal]) -> str:
     if market_cap is None:
         return ""
 
-    return format_currency(market_cap, include_symbol=True) + " " + format_number(market_cap, use_suffix=True).split()[-1] if market_cap >= 1000 else format_currency(market_cap)
+    try:
+        value = float(market_cap)
+    except (ValueError, TypeError):
+        return ""
+
+    if abs(value) >= 1000:
+        return f"Rs {format_number(value, use_suffix=True)}"
+
+    return format_currency(value)
 
 
 def format_price_change(
@@ -101,19 +142,13 @@ def format_price_change(
     if change is None:
         return ""
 
-    parts = [format_currency(abs(change), include_symbol=True)]
-
-    if change_pct is not None:
-        parts.append(f"({format_percentage(change_pct)})")
+    sign = "+" if change > 0 else "-" if change < 0 else ""
+    amount = format_currency(abs(change), include_symbol=True)
 
-    result = " ".join(parts)
+    if change_pct is None:
+        return f"{sign}{amount}"
 
-    if change > 0:
-        return f"+{result}"
-    elif change < 0:
-        return f"-{result}"
-
-    return result
+    return f"{sign}{amount} ({format_percentage(change_pct)})"
 
 
 def format_date(
@@ -142,16 +177,14 @@ def format_datetime(
         return ""
 
 
-def format_time_ago(datetime_obj) -> str:
+def format_time_ago(datetime_obj, now: Optional[datetime] = None) -> str:
     if datetime_obj is None:
         return ""
 
-    from datetime import datetime, timezone
-
     try:
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
         if datetime_obj.tzinfo is None:
-            from datetime import timezone
             datetime_obj = datetime_obj.replace(tzinfo=timezone.utc)
 
         diff = now - datetime_obj
@@ -1,17 +1,52 @@
 import asyncio
+import random
 import re
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 from functools import wraps
-from typing import Any, Callable, List, Optional, TypeVar
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar
 
 T = TypeVar("T")
 
+_SLUG_NONWORD = re.compile(r"[^\w\s-]")
+_SLUG_DASH = re.compile(r"[-\s]+")
+# A run of tags and whitespace; group 1 is set if the run holds any whitespace
+# outside a tag, in which case it collapses to one space, else it is dropped.
+_HTML_TAG_OR_SPACE = re.compile(r"(?:<[^>]+>|(\s))+")
+_NUMBER = re.compile(r"[-+]?\d*\.?\d+")
+
+# Strings datetime.fromisoformat parses the same way the ISO strptime formats
+# below would (trailing Z stripped, result naive).
+_ISO_DATETIME = re.compile(r"^\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2}(?:\.\d{1,6})?Z?)?$")
+_ISO_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+)
+_DASH_FORMATS = _ISO_FORMATS + ("%d-%m-%Y",)
+_SLASH_FORMATS = ("%d/%m/%Y", "%m/%d/%Y")
+_DAY_NAMED_FORMATS = ("%d %b %Y", "%d %B %Y")
+_MONTH_NAMED_FORMATS = ("%B %d, %Y",)
+
+
+def _candidate_formats(date_string: str) -> tuple:
+    """Narrow the default formats to those that can match this string's shape."""
+    if date_string[0].isalpha():
+        return _MONTH_NAMED_FORMATS
+    if " " in date_string:
+        return _DAY_NAMED_FORMATS
+    if "/" in date_string:
+        return _SLASH_FORMATS
+    return _DASH_FORMATS
+
 
 def generate_slug(text: str, max_length: int = 100) -> str:
     slug = text.lower()
-    slug = re.sub(r"[^\w\s-]", "", slug)
-    slug = re.sub(r"[-\s]+", "-", slug)
+    slug = _SLUG_NONWORD.sub("", slug)
+    slug = _SLUG_DASH.sub("-", slug)
     slug = slug.strip("-")
     return slug[:max_length]
 
@@ -23,21 +58,17 @@ def parse_datetime(
     if not date_string:
         return None
 
-    formats = formats or [
-        "%Y-%m-%d",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%dT%H:%M:%S.%f",
-        "%Y-%m-%dT%H:%M:%S.%fZ",
-        "%d %b %Y",
-        "%d %B %Y",
-        "%B %d, %Y",
-        "%d-%m-%Y",
-        "%d/%m/%Y",
-        "%m/%d/%Y",
-    ]
-
     date_string = date_string.strip()
+    if not date_string:
+        return None
+
+    if not formats:
+        if _ISO_DATETIME.match(date_string):
+            try:
+                return datetime.fromisoformat(date_string.rstrip("Z"))
+            except ValueError:
+                return None
+        formats = _candidate_formats(date_string)
 
     for fmt in formats:
         try:
@@ -52,11 +83,15 @@ def safe_decimal(value: Any, default: Optional[Decimal] = None) -> Optional[Deci
     if value is None:
         return default
 
+    if isinstance(value, Decimal):
+        return value
+
     try:
-        if isinstance(value, Decimal):
-            return value
+        if type(value) is int:  # exact ints convert directly (bools keep the str path)
+            return Decimal(value)
         if isinstance(value, str):
-            value = value.replace(",", "").strip()
+            return Decimal(value.replace(",", "").strip())
+        # Floats go through str() so 0.1 becomes Decimal("0.1"), not its binary expansion
         return Decimal(str(value))
     except (InvalidOperation, ValueError, TypeError):
         return default
@@ -67,6 +102,8 @@ def retry_async(
     delay: float = 1.0,
     backoff: float = 2.0,
     exceptions: tuple = (Exception,),
+    max_delay: float = 30.0,
+    jitter: float = 0.1,
 ):
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
@@ -80,7 +117,12 @@ def retry_async(
                 except exceptions as e:
                     last_exception = e
                     if attempt < max_retries - 1:
-                        await asyncio.sleep(current_delay)
+                        # Cap the backoff and jitter it so concurrent callers
+                        # retrying the same backend don't wake in lockstep.
+                        sleep_for = min(current_delay, max_delay)
+                        if jitter:
+                            sleep_for *= 1 + random.uniform(-jitter, jitter)
+                        await asyncio.sleep(sleep_for)
                         current_delay *= backoff
 
             raise last_exception
@@ -94,18 +136,28 @@ def chunks(lst: List[T], size: int) -> List[List[T]]:
     return [lst[i:i + size] for i in range(0, len(lst), size)]
 
 
+def ichunks(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Lazily yield lists of up to size items from any iterable."""
+    it = iter(iterable)
+    return iter(lambda: list(islice(it, size)), [])
+
+
 def flatten(nested_list: List[List[T]]) -> List[T]:
-    return [item for sublist in nested_list for item in sublist]
+    return list(chain.from_iterable(nested_list))
 
 
 def remove_duplicates(lst: List[T], key: Optional[Callable[[T], Any]] = None) -> List[T]:
+    if key is None:
+        return list(dict.fromkeys(lst))
+
     seen = set()
+    add = seen.add
     result = []
 
     for item in lst:
-        k = key(item) if key else item
+        k = key(item)
         if k not in seen:
-            seen.add(k)
+            add(k)
             result.append(item)
 
     return result
@@ -117,16 +169,16 @@ def truncate_string(text: str, max_length: int, suffix: str = "...") -> str:
     return text[:max_length - len(suffix)] + suffix
 
 
+def _tag_or_space(match: "re.Match[str]") -> str:
+    return " " if match.group(1) else ""
+
+
 def clean_html(html: str) -> str:
-    clean = re.sub(r"<[^>]+>", "", html)
-    clean = re.sub(r"\s+", " ", clean)
-    return clean.strip()
+    return _HTML_TAG_OR_SPACE.sub(_tag_or_space, html).strip()
 
 
 def extract_numbers(text: str) -> List[float]:
-    pattern = r"[-+]?\d*\.?\d+"
-    matches = re.findall(pattern, text)
-    return [float(m) for m in matches]
+    return [float(m) for m in _NUMBER.findall(text)]
 
 
 def mask_string(text: str, visible_chars: int = 4, mask_char: str = "*") -> str:
@@ -1,9 +1,29 @@
 import re
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 
+MAX_EMAIL_LENGTH = 254  # RFC 5321 path limit
+MAX_URL_LENGTH = 2048
 
+# Used with fullmatch, so no ^/$ anchors (and no trailing-newline loophole)
+_EMAIL = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_URL = re.compile(r"https?://[^\s/$.?#].[^\s]*", re.IGNORECASE)
+_PHONE_STRIP = str.maketrans("", "", " \t\n\r\f\v-()")
+# +92XXXXXXXXXX, 92XXXXXXXXXX, 0XXXXXXXXXX or a bare 10-digit number
+_PHONE = re.compile(r"^(?:\+?92|0)?\d{10}$")
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_STOCK_SYMBOL = re.compile(r"^[A-Z]{2,10}$")
+_UNSAFE_CHARS = str.maketrans("", "", "<>\"'")
+
+
+@lru_cache(maxsize=4096)
 def validate_uuid(value: str) -> bool:
+    # Canonical hyphenated form without building a UUID; other spellings UUID()
+    # accepts (braces, urn:uuid:, bare hex) still go through the constructor.
+    if isinstance(value, str) and _UUID.fullmatch(value):
+        return True
+
     try:
         UUID(value)
         return True
@@ -11,35 +31,27 @@ def validate_uuid(value: str) -> bool:
         return False
 
 
+@lru_cache(maxsize=4096)
 def validate_email(email: str) -> bool:
-    if not email:
+    if not email or len(email) > MAX_EMAIL_LENGTH:
         return False
 
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return bool(re.match(pattern, email))
+    return _EMAIL.fullmatch(email) is not None
 
 
 def validate_url(url: str) -> bool:
-    if not url:
+    if not url or len(url) > MAX_URL_LENGTH:
         return False
 
-    pattern = r"^https?://[^\s/$.?#].[^\s]*$"
-    return bool(re.match(pattern, url, re.IGNORECASE))
+    return _URL.fullmatch(url) is not None
 
 
+@lru_cache(maxsize=1024)
 def validate_phone_pakistan(phone: str) -> bool:
     if not phone:
         return False
 
-    phone = re.sub(r"[\s\-\(\)]", "", phone)
-    patterns = [
-        r"^\+92\d{10}$",
-        r"^92\d{10}$",
-        r"^0\d{10}$",
-        r"^\d{10}$",
-    ]
-
-    return any(re.match(pattern, phone) for pattern in patterns)
+    return _PHONE.match(phone.translate(_PHONE_STRIP)) is not None
 
 
 def validate_cnic(cnic: str) -> bool:
@@ -53,12 +65,12 @@ def validate_cnic(cnic: str) -> bool:
     return cnic.isdigit()
 
 
+@lru_cache(maxsize=4096)
 def validate_stock_symbol(symbol: str) -> bool:
     if not symbol:
         return False
 
-    pattern = r"^[A-Z]{2,10}$"
-    return bool(re.match(pattern, symbol.upper()))
+    return bool(_STOCK_SYMBOL.match(symbol.upper()))
 
 
 def validate_positive_number(value: float) -> bool:
@@ -92,7 +104,7 @@ def sanitize_string(text: str, max_length: Optional[int] = None) -> str:
     if not text:
         return ""
 
-    sanitized = re.sub(r"[<>\"']", "", text)
+    sanitized = text.translate(_UNSAFE_CHARS)
     sanitized = " ".join(sanitized.split())
 
     if max_length:
@@ -26,11 +26,11 @@ class ConnectionManager:
     """
 
     def __init__(self):
-        # Active connections: {user_id: [websocket, ...]}
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+        # Active connections: {user_id: {websocket, ...}}
+        self.active_connections: Dict[str, Set[WebSocket]] = {}
 
         # Anonymous connections (not authenticated)
-        self.anonymous_connections: List[WebSocket] = []
+        self.anonymous_connections: Set[WebSocket] = set()
 
         # Subscriptions: {topic: set(user_ids)}
         self.subscriptions: Dict[str, Set[str]] = {
@@ -41,12 +41,22 @@ class ConnectionManager:
             "portfolio": set(),   # Portfolio value updates
         }
 
+        # Inverted index of subscriptions: {topic: set(websockets)}, plus the
+        # topics each socket is in so disconnect doesn't scan every topic
+        self.topic_connections: Dict[str, Set[WebSocket]] = {
+            topic: set() for topic in self.subscriptions
+        }
+        self._ws_topics: Dict[int, Set[str]] = {}
+
         # Symbol-specific subscriptions: {symbol: set(user_ids)}
         self.symbol_subscriptions: Dict[str, Set[str]] = {}
 
         # Connection metadata
         self.connection_info: Dict[str, Dict[str, Any]] = {}
 
+        # Reverse index: id(websocket) -> connection_id
+        self._ws_to_conn_id: Dict[int, str] = {}
+
     async def connect(
         self,
         websocket: WebSocket,
@@ -62,14 +72,17 @@ class ConnectionManager:
         connection_id = f"{user_id or 'anon'}_{datetime.utcnow().timestamp()}"
 
         if user_id:
-            if user_id not in self.active_connections:
-                self.active_connections[user_id] = []
-            self.active_connections[user_id].append(websocket)
+            self.active_connections.setdefault(user_id, set()).add(websocket)
 
             # Auto-subscribe authenticated users to alerts
             self.subscriptions["alerts"].add(user_id)
+
+            # Pick up topics this user already subscribed to on other connections
+            for topic, subscribers in self.subscriptions.items():
+                if user_id in subscribers:
+                    self._index_topic(websocket, topic)
         else:
-            self.anonymous_connections.append(websocket)
+            self.anonymous_connections.add(websocket)
 
         self.connection_info[connection_id] = {
             "user_id": user_id,
@@ -77,6 +90,7 @@ class ConnectionManager:
             "connected_at": datetime.utcnow().isoformat(),
             "subscriptions": [],
         }
+        self._ws_to_conn_id[id(websocket)] = connection_id
 
         logger.info(f"WebSocket connected: {connection_id}")
         return connection_id
@@ -88,23 +102,24 @@ class ConnectionManager:
     ):
         """Remove a WebSocket connection."""
         if user_id and user_id in self.active_connections:
-            if websocket in self.active_connections[user_id]:
-                self.active_connections[user_id].remove(websocket)
+            self.active_connections[user_id].discard(websocket)
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
                 # Remove from all subscriptions
                 for topic_subscribers in self.subscriptions.values():
                     topic_subscribers.discard(user_id)
-                for symbol_subscribers in self.symbol_subscriptions.values():
-                    symbol_subscribers.discard(user_id)
-        elif websocket in self.anonymous_connections:
-            self.anonymous_connections.remove(websocket)
+                for symbol in list(self.symbol_subscriptions):
+                    self._discard_symbol_subscriber(symbol, user_id)
+        else:
+            self.anonymous_connections.discard(websocket)
+
+        for topic in self._ws_topics.pop(id(websocket), ()):
+            self.topic_connections[topic].discard(websocket)
 
         # Clean up connection info
-        for conn_id, info in list(self.connection_info.items()):
-            if info["websocket"] == websocket:
-                del self.connection_info[conn_id]
-                break
+        conn_id = self._ws_to_conn_id.pop(id(websocket), None)
+        if conn_id:
+            self.connection_info.pop(conn_id, None)
 
         logger.info(f"WebSocket disconnected: user_id={user_id}")
 
@@ -117,6 +132,8 @@ class ConnectionManager:
         """Subscribe a user to a topic or specific symbols."""
         if topic in self.subscriptions:
             self.subscriptions[topic].add(user_id)
+            for websocket in self.active_connections.get(user_id, ()):
+                self._index_topic(websocket, topic)
 
         if symbols:
             for symbol in symbols:
@@ -135,11 +152,56 @@ class ConnectionManager:
         """Unsubscribe a user from a topic or specific symbols."""
         if topic and topic in self.subscriptions:
             self.subscriptions[topic].discard(user_id)
+            for websocket in self.active_connections.get(user_id, ()):
+                self.topic_connections[topic].discard(websocket)
+                self._ws_topics.get(id(websocket), set()).discard(topic)
 
         if symbols:
             for symbol in symbols:
-                if symbol in self.symbol_subscriptions:
-                    self.symbol_subscriptions[symbol].discard(user_id)
+                self._discard_symbol_subscriber(symbol, user_id)
+
+    def _discard_symbol_subscriber(self, symbol: str, user_id: str):
+        """Drop a symbol subscriber, pruning the symbol once nobody follows it."""
+        subscribers = self.symbol_subscriptions.get(symbol)
+        if subscribers is None:
+            return
+        subscribers.discard(user_id)
+        if not subscribers:
+            del self.symbol_subscriptions[symbol]
+
+    def has_price_subscribers(self) -> bool:
+        """Whether anyone wants price updates, by topic or by symbol."""
+        return bool(self.subscriptions["prices"]) or any(self.symbol_subscriptions.values())
+
+    def _index_topic(self, websocket: WebSocket, topic: str):
+        self.topic_connections[topic].add(websocket)
+        self._ws_topics.setdefault(id(websocket), set()).add(topic)
+
+    @staticmethod
+    def _encode(message: Dict[str, Any]) -> str:
+        """Serialize a message once so every recipient gets the same payload."""
+        return json.dumps(message, separators=(",", ":"))
+
+    def _connections_for(self, user_ids: Set[str]) -> List[WebSocket]:
+        """All live connections belonging to the given users."""
+        return [
+            websocket
+            for user_id in user_ids
+            for websocket in self.active_connections.get(user_id, ())
+        ]
+
+    async def _send_all(self, websockets: List[WebSocket], payload: str, target: str):
+        """Send to all connections concurrently so one slow client can't stall the rest."""
+        await self._gather_sends(
+            (websocket.send_text(payload) for websocket in websockets), target
+        )
+
+    @staticmethod
+    async def _gather_sends(sends, target: str):
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error sending to {target}: {result}")
 
     async def send_personal_message(
         self,
@@ -147,15 +209,11 @@ class ConnectionManager:
         user_id: str,
     ):
         """Send a message to a specific user (all their connections)."""
-        if user_id not in self.active_connections:
+        websockets = self.active_connections.get(user_id)
+        if not websockets:
             return
 
-        message_json = json.dumps(message)
-        for websocket in self.active_connections[user_id]:
-            try:
-                await websocket.send_text(message_json)
-            except Exception as e:
-                logger.error(f"Error sending to user {user_id}: {e}")
+        await self._send_all(list(websockets), self._encode(message), f"user {user_id}")
 
     async def broadcast_to_topic(
         self,
@@ -163,17 +221,11 @@ class ConnectionManager:
         topic: str,
     ):
         """Broadcast a message to all subscribers of a topic."""
-        if topic not in self.subscriptions:
+        websockets = list(self.topic_connections.get(topic, ()))
+        if not websockets:
             return
 
-        message_json = json.dumps(message)
-        for user_id in self.subscriptions[topic]:
-            if user_id in self.active_connections:
-                for websocket in self.active_connections[user_id]:
-                    try:
-                        await websocket.send_text(message_json)
-                    except Exception as e:
-                        logger.error(f"Error broadcasting to {user_id}: {e}")
+        await self._send_all(websockets, self._encode(message), f"topic {topic}")
 
     async def broadcast_to_symbol(
         self,
@@ -181,41 +233,57 @@ class ConnectionManager:
         symbol: str,
     ):
         """Broadcast a message to all subscribers of a specific symbol."""
-        if symbol not in self.symbol_subscriptions:
+        websockets = self._connections_for(self.symbol_subscriptions.get(symbol, set()))
+        if not websockets:
             return
 
-        message_json = json.dumps(message)
-        for user_id in self.symbol_subscriptions[symbol]:
-            if user_id in self.active_connections:
-                for websocket in self.active_connections[user_id]:
-                    try:
-                        await websocket.send_text(message_json)
-                    except Exception as e:
-                        logger.error(f"Error broadcasting symbol {symbol} to {user_id}: {e}")
+        await self._send_all(websockets, self._encode(message), f"symbol {symbol}")
+
+    async def broadcast_symbol_batch(
+        self,
+        updates: Dict[str, Any],
+        envelope: Dict[str, Any],
+    ):
+        """
+        Send each symbol subscriber one message carrying every update it follows.
+
+        `updates` maps symbol -> payload; each connection receives
+        {**envelope, "data": [payload, ...]} for its subscribed symbols.
+        """
+        per_connection: Dict[WebSocket, List[Any]] = {}
+        for symbol, data in updates.items():
+            for websocket in self._connections_for(self.symbol_subscriptions.get(symbol, set())):
+                per_connection.setdefault(websocket, []).append(data)
+
+        if not per_connection:
+            return
+
+        await self._gather_sends(
+            (
+                websocket.send_text(self._encode({**envelope, "data": items}))
+                for websocket, items in per_connection.items()
+            ),
+            "symbol subscribers",
+        )
 
     async def broadcast_all(self, message: Dict[str, Any]):
         """Broadcast a message to all connected clients."""
-        message_json = json.dumps(message)
-
-        # Authenticated users
-        for user_id, websockets in self.active_connections.items():
-            for websocket in websockets:
-                try:
-                    await websocket.send_text(message_json)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to {user_id}: {e}")
-
-        # Anonymous users
-        for websocket in self.anonymous_connections:
-            try:
-                await websocket.send_text(message_json)
-            except Exception as e:
-                logger.error(f"Error broadcasting to anonymous: {e}")
+        websockets = self._connections_for(set(self.active_connections))
+        websockets.extend(self.anonymous_connections)
+        if not websockets:
+            return
+
+        await self._send_all(websockets, self._encode(message), "all")
+
+    @staticmethod
+    def _ping_payload() -> str:
+        # Only the timestamp varies, so skip json.dumps for the fixed envelope
+        return '{"type":"ping","timestamp":"' + datetime.utcnow().isoformat() + '"}'
 
     async def send_ping(self, websocket: WebSocket) -> bool:
         """Send ping to check connection health."""
         try:
-            await websocket.send_json({"type": "ping", "timestamp": datetime.utcnow().isoformat()})
+            await websocket.send_text(self._ping_payload())
             return True
         except Exception:
             return False
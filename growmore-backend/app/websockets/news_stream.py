@@ -5,6 +5,8 @@ Real-time news and alert updates.
 
 import asyncio
 import logging
+import re
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Set
 
@@ -12,6 +14,16 @@ from app.websockets.connection_manager import manager
 
 logger = logging.getLogger(__name__)
 
+SEEN_NEWS_LIMIT = 1000
+
+BREAKING_KEYWORDS = [
+    "breaking", "urgent", "just in", "alert",
+    "sbp", "interest rate", "monetary policy",
+    "crash", "surge", "plunge", "soar",
+]
+# Substring match, like `kw in title.lower()`, in a single scan
+_BREAKING_RE = re.compile("|".join(map(re.escape, BREAKING_KEYWORDS)), re.IGNORECASE)
+
 
 class NewsStreamManager:
     """
@@ -29,7 +41,11 @@ class NewsStreamManager:
         self.stream_task: Optional[asyncio.Task] = None
         self.check_interval = 30  # seconds
         self.last_check_time: Optional[datetime] = None
+        # seen_news_ids for O(1) membership, _seen_order to evict the oldest
         self.seen_news_ids: Set[str] = set()
+        self._seen_order: deque = deque()
+        # Newest created_at delivered so far; the next query starts from here
+        self._max_created_at: Optional[str] = None
 
     async def start_streaming(self):
         """Start the news streaming background task."""
@@ -60,13 +76,15 @@ class NewsStreamManager:
                 new_articles = await self._fetch_new_articles()
 
                 if new_articles:
+                    timestamp = datetime.utcnow().isoformat()
+
                     # Broadcast to news subscribers
-                    await self._broadcast_news(new_articles)
+                    await self._broadcast_news(new_articles, timestamp)
 
                     # Check for breaking/important news
                     breaking = [a for a in new_articles if self._is_breaking_news(a)]
                     if breaking:
-                        await self._broadcast_breaking_news(breaking)
+                        await self._broadcast_breaking_news(breaking, timestamp)
 
                 self.last_check_time = datetime.utcnow()
                 await asyncio.sleep(self.check_interval)
@@ -86,27 +104,37 @@ class NewsStreamManager:
         try:
             db = get_supabase_service_client()
 
-            # Get articles from last check time
-            since = (self.last_check_time or datetime.utcnow() - timedelta(minutes=5)).isoformat()
+            # Get articles from the newest one already delivered, or the last check time
+            since = self._max_created_at or (
+                self.last_check_time or datetime.utcnow() - timedelta(minutes=5)
+            ).isoformat()
 
             result = db.table("news_articles").select(
                 "id,title,summary,source,url,category,sentiment,impact_score,published_at,created_at"
             ).gte("created_at", since).order("created_at", desc=True).limit(50).execute()
 
-            for article in (result.data or []):
+            rows = result.data or []
+            if rows:
+                # Ordered newest first, and never older than the previous watermark
+                self._max_created_at = rows[0]["created_at"]
+
+            for article in rows:
                 if article["id"] not in self.seen_news_ids:
                     new_articles.append(article)
-                    self.seen_news_ids.add(article["id"])
-
-            # Clean up old IDs (keep last 1000)
-            if len(self.seen_news_ids) > 1000:
-                self.seen_news_ids = set(list(self.seen_news_ids)[-500:])
+                    self._mark_seen(article["id"])
 
         except Exception as e:
             logger.error(f"Error fetching news: {e}")
 
         return new_articles
 
+    def _mark_seen(self, article_id: str):
+        """Remember an article id, evicting the oldest once SEEN_NEWS_LIMIT is reached."""
+        if len(self._seen_order) >= SEEN_NEWS_LIMIT:
+            self.seen_news_ids.discard(self._seen_order.popleft())
+        self._seen_order.append(article_id)
+        self.seen_news_ids.add(article_id)
+
     def _is_breaking_news(self, article: Dict[str, Any]) -> bool:
         """Check if an article qualifies as breaking news."""
         # High impact score
@@ -114,30 +142,21 @@ class NewsStreamManager:
             return True
 
         # Contains breaking keywords
-        title = (article.get("title") or "").lower()
-        breaking_keywords = [
-            "breaking", "urgent", "just in", "alert",
-            "sbp", "interest rate", "monetary policy",
-            "crash", "surge", "plunge", "soar",
-        ]
-        if any(kw in title for kw in breaking_keywords):
-            return True
+        return _BREAKING_RE.search(article.get("title") or "") is not None
 
-        return False
-
-    async def _broadcast_news(self, articles: List[Dict[str, Any]]):
+    async def _broadcast_news(self, articles: List[Dict[str, Any]], timestamp: str):
         """Broadcast news updates to subscribers."""
         await manager.broadcast_to_topic(
             {
                 "type": "news_update",
                 "data": articles,
                 "count": len(articles),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp,
             },
             topic="news",
         )
 
-    async def _broadcast_breaking_news(self, articles: List[Dict[str, Any]]):
+    async def _broadcast_breaking_news(self, articles: List[Dict[str, Any]], timestamp: str):
         """Broadcast breaking news to all connected users."""
         for article in articles:
             await manager.broadcast_all(
@@ -151,7 +170,7 @@ class NewsStreamManager:
                         "url": article.get("url"),
                         "impact_score": article.get("impact_score"),
                     },
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": timestamp,
                 }
             )
 
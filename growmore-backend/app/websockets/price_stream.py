@@ -29,6 +29,8 @@ class PriceStreamManager:
         self.stream_task: Optional[asyncio.Task] = None
         self.update_interval = 5  # seconds
         self.last_prices: Dict[str, Dict[str, Any]] = {}
+        # Newest updated_at seen per table; later polls only ask for newer rows
+        self._watermarks: Dict[str, str] = {}
 
     async def start_streaming(self):
         """Start the price streaming background task."""
@@ -54,6 +56,16 @@ class PriceStreamManager:
         """Main streaming loop."""
         while self.is_streaming:
             try:
+                # Nobody is listening; skip the database round trips. The cache
+                # goes stale while idle, so drop it along with the watermarks:
+                # the first poll after the gap then refetches every row and
+                # snapshots never serve prices from before it.
+                if not manager.has_price_subscribers():
+                    self.last_prices.clear()
+                    self._watermarks.clear()
+                    await asyncio.sleep(self.update_interval)
+                    continue
+
                 # Fetch latest prices
                 prices = await self._fetch_latest_prices()
 
@@ -62,10 +74,10 @@ class PriceStreamManager:
 
                 if changed:
                     # Broadcast to subscribers
-                    await self._broadcast_prices(changed)
+                    await self._broadcast_prices(changed, datetime.utcnow().isoformat())
 
-                # Update cache
-                self.last_prices = prices
+                # Update cache (polls after the first only return updated rows)
+                self.last_prices.update(prices)
 
                 await asyncio.sleep(self.update_interval)
 
@@ -89,11 +101,12 @@ class PriceStreamManager:
             db = get_supabase_service_client()
 
             # Fetch stock prices
-            result = db.table("stocks").select(
-                "symbol,current_price,change_amount,change_percentage,volume,updated_at"
-            ).execute()
+            stocks = self._fetch_updated(
+                db, "stocks",
+                "symbol,current_price,change_amount,change_percentage,volume,updated_at",
+            )
 
-            for stock in (result.data or []):
+            for stock in stocks:
                 prices[stock["symbol"]] = {
                     "type": "stock",
                     "symbol": stock["symbol"],
@@ -105,11 +118,12 @@ class PriceStreamManager:
                 }
 
             # Fetch commodity prices
-            commodity_result = db.table("commodities").select(
-                "symbol,name,current_price,change_amount,change_percentage,updated_at"
-            ).execute()
+            commodities = self._fetch_updated(
+                db, "commodities",
+                "symbol,name,current_price,change_amount,change_percentage,updated_at",
+            )
 
-            for commodity in (commodity_result.data or []):
+            for commodity in commodities:
                 prices[commodity["symbol"]] = {
                     "type": "commodity",
                     "symbol": commodity["symbol"],
@@ -121,11 +135,12 @@ class PriceStreamManager:
                 }
 
             # Fetch index data
-            index_result = db.table("market_indices").select(
-                "symbol,name,current_value,change_amount,change_percentage,updated_at"
-            ).execute()
+            indices = self._fetch_updated(
+                db, "market_indices",
+                "symbol,name,current_value,change_amount,change_percentage,updated_at",
+            )
 
-            for index in (index_result.data or []):
+            for index in indices:
                 prices[index["symbol"]] = {
                     "type": "index",
                     "symbol": index["symbol"],
@@ -141,6 +156,20 @@ class PriceStreamManager:
 
         return prices
 
+    def _fetch_updated(self, db, table: str, columns: str) -> List[Dict[str, Any]]:
+        """Rows of table updated since the last poll, advancing its watermark."""
+        query = db.table(table).select(columns)
+        since = self._watermarks.get(table)
+        if since:
+            query = query.gte("updated_at", since)
+
+        rows = query.execute().data or []
+
+        timestamps = [row["updated_at"] for row in rows if row.get("updated_at")]
+        if timestamps:
+            self._watermarks[table] = max(timestamps)
+        return rows
+
     def _get_changed_prices(
         self,
         new_prices: Dict[str, Dict[str, Any]],
@@ -160,28 +189,23 @@ class PriceStreamManager:
 
         return changed
 
-    async def _broadcast_prices(self, prices: Dict[str, Dict[str, Any]]):
-        """Broadcast price updates to subscribers."""
+    async def _broadcast_prices(self, prices: Dict[str, Dict[str, Any]], timestamp: str):
+        """Broadcast price updates to subscribers, all stamped with this tick's timestamp."""
         # Broadcast to general price subscribers
         await manager.broadcast_to_topic(
             {
                 "type": "price_update",
                 "data": list(prices.values()),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp,
             },
             topic="prices",
         )
 
-        # Broadcast to symbol-specific subscribers
-        for symbol, data in prices.items():
-            await manager.broadcast_to_symbol(
-                {
-                    "type": "price_update",
-                    "data": data,
-                    "timestamp": datetime.utcnow().isoformat(),
-                },
-                symbol=symbol,
-            )
+        # Symbol-specific subscribers get one batched update per connection
+        await manager.broadcast_symbol_batch(
+            prices,
+            {"type": "price_update", "timestamp": timestamp},
+        )
 
     async def send_price_snapshot(
         self,
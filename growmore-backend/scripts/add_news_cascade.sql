@@ -0,0 +1,22 @@
+-- ============================================================
+-- GrowMore - News Child Tables: ON DELETE CASCADE
+-- ============================================================
+-- Makes deleting a news_articles row remove its embeddings and
+-- entity mentions server-side, so cleanup jobs only need to issue
+-- the parent DELETE. Safe to re-run.
+-- Run this in Supabase SQL Editor.
+-- ============================================================
+
+ALTER TABLE news_embeddings
+    DROP CONSTRAINT IF EXISTS news_embeddings_news_id_fkey,
+    ADD CONSTRAINT news_embeddings_news_id_fkey
+        FOREIGN KEY (news_id) REFERENCES news_articles(id) ON DELETE CASCADE;
+
+ALTER TABLE news_entity_mentions
+    DROP CONSTRAINT IF EXISTS news_entity_mentions_news_id_fkey,
+    ADD CONSTRAINT news_entity_mentions_news_id_fkey
+        FOREIGN KEY (news_id) REFERENCES news_articles(id) ON DELETE CASCADE;
+
+-- Without these the cascade scans each child table once per deleted article
+CREATE INDEX IF NOT EXISTS idx_news_embeddings_news_id ON news_embeddings(news_id);
+CREATE INDEX IF NOT EXISTS idx_news_entity_mentions_news_id ON news_entity_mentions(news_id);
@@ -0,0 +1,58 @@
+-- ============================================================
+-- GrowMore - News Cleanup Functions
+-- ============================================================
+-- Server-side find-and-delete for scripts/cleanup_news.py, so each
+-- cleanup step is one RPC instead of a select followed by deletes.
+-- Relies on the cascading FKs from add_news_cascade.sql.
+-- Run this in Supabase SQL Editor.
+-- ============================================================
+
+-- Deletes up to max_rows articles older than days_to_keep and returns how many
+-- went; callers repeat until it returns less than max_rows, which keeps
+-- each statement (and its cascade) short.
+CREATE OR REPLACE FUNCTION cleanup_old_news(days_to_keep int, max_rows int DEFAULT 5000)
+RETURNS int
+LANGUAGE sql
+AS $$
+    WITH deleted AS (
+        DELETE FROM news_articles
+        WHERE id IN (
+            SELECT id FROM news_articles
+            WHERE published_at < NOW() - make_interval(days => days_to_keep)
+            LIMIT max_rows
+        )
+        RETURNING id
+    )
+    SELECT count(*)::int FROM deleted;
+$$;
+
+-- Deletes the named sources and all of their articles; returns the
+-- names of the sources that were removed.
+CREATE OR REPLACE FUNCTION delete_news_sources_by_names(names text[])
+RETURNS TABLE (
+    name text
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM news_articles a
+    USING news_sources s
+    WHERE a.source_id = s.id AND s.name = ANY(names);
+
+    RETURN QUERY
+    WITH deleted AS (
+        DELETE FROM news_sources s
+        WHERE s.name = ANY(names)
+        RETURNING s.name::text
+    )
+    SELECT * FROM deleted;
+END;
+$$;
+
+-- Functions are executable by PUBLIC by default, and Supabase exposes
+-- public functions over /rpc to anon and authenticated; keep these
+-- to the service key the scripts use.
+REVOKE EXECUTE ON FUNCTION cleanup_old_news(int, int) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION delete_news_sources_by_names(text[]) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION cleanup_old_news(int, int) TO service_role;
+GRANT EXECUTE ON FUNCTION delete_news_sources_by_names(text[]) TO service_role;
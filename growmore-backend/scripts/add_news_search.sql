@@ -0,0 +1,36 @@
+-- ============================================================
+-- GrowMore - News Full-Text Search Column
+-- ============================================================
+-- Adds a generated tsvector over title + summary with a GIN index,
+-- and a delete_news_matching() RPC so keyword sweeps are one indexed
+-- query instead of one ILIKE '%...%' scan per keyword.
+-- Run add_news_cascade.sql first so child rows go with the articles.
+-- Run this in Supabase SQL Editor.
+-- ============================================================
+
+ALTER TABLE news_articles
+    ADD COLUMN IF NOT EXISTS search_tsv tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(summary, ''))
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_news_articles_search_tsv ON news_articles USING gin(search_tsv);
+
+-- q is a to_tsquery expression, e.g. 'sensex | nifty | reserve <-> bank'
+CREATE OR REPLACE FUNCTION delete_news_matching(q text)
+RETURNS TABLE (
+    id uuid,
+    title text
+)
+LANGUAGE sql
+AS $$
+    DELETE FROM news_articles a
+    WHERE a.search_tsv @@ to_tsquery('simple', q)
+    RETURNING a.id, a.title::text;
+$$;
+
+-- Functions are executable by PUBLIC by default, and Supabase exposes
+-- public functions over /rpc to anon and authenticated; keep these
+-- to the service key the scripts use.
+REVOKE EXECUTE ON FUNCTION delete_news_matching(text) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION delete_news_matching(text) TO service_role;
@@ -0,0 +1,56 @@
+-- ============================================================
+-- GrowMore - Sample Price Bulk Updates
+-- ============================================================
+-- Set-based price updates for scripts/seed_sample_prices.py, so each
+-- table is refreshed with one RPC instead of a lookup and an UPDATE
+-- per row.
+-- Run this in Supabase SQL Editor.
+-- ============================================================
+
+-- payload: [{"symbol": "HBL", "price": 145.5, "change": 2.3, "change_pct": 1.61, "volume": 2500000}, ...]
+-- Returns the symbols whose stock row was updated.
+CREATE OR REPLACE FUNCTION update_stock_prices_bulk(payload jsonb)
+RETURNS TABLE (
+    symbol text
+)
+LANGUAGE sql
+AS $$
+    UPDATE stocks s SET
+        current_price = p.price,
+        change_amount = p.change,
+        change_percentage = p.change_pct,
+        volume = p.volume,
+        last_updated = NOW()
+    FROM jsonb_to_recordset(payload)
+            AS p(symbol text, price numeric, change numeric, change_pct numeric, volume bigint)
+        JOIN companies c ON c.symbol = p.symbol
+    WHERE s.company_id = c.id
+    RETURNING c.symbol::text;
+$$;
+
+-- payload: [{"name": "Silver (Per Tola)", "price": 2950, "change": 25, "change_pct": 0.86}, ...]
+-- Returns the names of the commodities that were updated.
+CREATE OR REPLACE FUNCTION update_commodity_prices_bulk(payload jsonb)
+RETURNS TABLE (
+    name text
+)
+LANGUAGE sql
+AS $$
+    UPDATE commodities c SET
+        current_price = p.price,
+        change_amount = p.change,
+        change_percentage = p.change_pct,
+        last_updated = NOW()
+    FROM jsonb_to_recordset(payload)
+            AS p(name text, price numeric, change numeric, change_pct numeric)
+    WHERE c.name = p.name
+    RETURNING c.name::text;
+$$;
+
+-- Functions are executable by PUBLIC by default, and Supabase exposes
+-- public functions over /rpc to anon and authenticated; keep these
+-- to the service key the scripts use.
+REVOKE EXECUTE ON FUNCTION update_stock_prices_bulk(jsonb) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION update_commodity_prices_bulk(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION update_stock_prices_bulk(jsonb) TO service_role;
+GRANT EXECUTE ON FUNCTION update_commodity_prices_bulk(jsonb) TO service_role;
@@ -0,0 +1,50 @@
+-- ============================================================
+-- GrowMore - Stock Movers Materialized View
+-- ============================================================
+-- Precomputes the flattened stock + company rows that back the
+-- top gainers / top losers / most active lists, so those reads are
+-- an index scan instead of a join + sort per request.
+-- Run this in Supabase SQL Editor.
+-- ============================================================
+
+DROP MATERIALIZED VIEW IF EXISTS mv_stock_movers;
+
+CREATE MATERIALIZED VIEW mv_stock_movers AS
+SELECT
+    s.id,
+    s.company_id,
+    c.market_id,
+    c.symbol,
+    c.name,
+    c.logo_url,
+    s.current_price,
+    s.change_amount,
+    s.change_percentage,
+    s.volume,
+    s.market_cap,
+    s.last_updated
+FROM stocks s
+JOIN companies c ON c.id = s.company_id
+WHERE c.is_active = true;
+
+-- Unique index is required for REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_stock_movers_id ON mv_stock_movers(id);
+CREATE INDEX IF NOT EXISTS idx_mv_stock_movers_change ON mv_stock_movers(market_id, change_percentage DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_mv_stock_movers_volume ON mv_stock_movers(market_id, volume DESC NULLS LAST);
+
+-- REFRESH needs the view owner's rights, so this stays SECURITY DEFINER;
+-- it is pinned to public and callable only with the service key.
+CREATE OR REPLACE FUNCTION refresh_stock_movers()
+RETURNS void
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    REFRESH MATERIALIZED VIEW CONCURRENTLY mv_stock_movers;
+$$;
+
+REVOKE EXECUTE ON FUNCTION refresh_stock_movers() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION refresh_stock_movers() TO service_role;
+
+-- PSXDataWriter.batch_update_stock_prices calls refresh_stock_movers() after
+-- every price sync, so the view follows the same schedule as the stocks table.
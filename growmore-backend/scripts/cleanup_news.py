@@ -2,6 +2,7 @@
 Clean up old news articles and remove Indian news sources.
 """
 import sys
+import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -9,6 +10,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.db.supabase import get_supabase_service_client
 
+PAGE_SIZE = 5000  # articles per cleanup_old_news call
+
 
 def cleanup_old_articles(days: int = 30):
     """Remove news articles older than specified days."""
@@ -18,35 +21,21 @@ def cleanup_old_articles(days: int = 30):
 
     print(f"Cleaning up articles older than {days} days (before {cutoff_date[:10]})")
 
-    # First, delete embeddings for old articles
-    old_articles = client.table("news_articles").select("id").lt(
-        "published_at", cutoff_date
-    ).execute()
-
-    if old_articles.data:
-        article_ids = [a["id"] for a in old_articles.data]
-        print(f"Found {len(article_ids)} old articles to clean up")
-
-        # Delete embeddings first (foreign key constraint)
-        for article_id in article_ids:
-            try:
-                client.table("news_embeddings").delete().eq("news_id", article_id).execute()
-            except Exception as e:
-                pass  # May not exist
-
-        # Delete entity mentions
-        for article_id in article_ids:
-            try:
-                client.table("news_entity_mentions").delete().eq("news_id", article_id).execute()
-            except Exception as e:
-                pass  # May not exist
-
-        # Delete old articles
-        result = client.table("news_articles").delete().lt(
-            "published_at", cutoff_date
+    # The RPC deletes at most PAGE_SIZE rows per call so each statement
+    # (plus its cascade to embeddings and entity mentions) stays short
+    deleted = 0
+    while True:
+        result = client.rpc(
+            "cleanup_old_news", {"days_to_keep": days, "max_rows": PAGE_SIZE}
         ).execute()
-
-        print(f"Deleted {len(article_ids)} old articles")
+        count = result.data or 0
+        deleted += count
+        if count < PAGE_SIZE:
+            break
+        print(f"  Deleted {deleted} old articles so far...")
+
+    if deleted:
+        print(f"Deleted {deleted} old articles")
     else:
         print("No old articles to clean up")
 
@@ -72,47 +61,16 @@ def remove_indian_sources():
 
     print("Removing Indian news sources...")
 
-    removed = 0
-    for source_name in indian_sources:
-        # Find the source
-        source = client.table("news_sources").select("id").eq("name", source_name).execute()
-
-        if source.data:
-            source_id = source.data[0]["id"]
-
-            # Delete articles from this source first
-            articles = client.table("news_articles").select("id").eq("source_id", source_id).execute()
-
-            if articles.data:
-                article_ids = [a["id"] for a in articles.data]
-
-                # Delete embeddings
-                for article_id in article_ids:
-                    try:
-                        client.table("news_embeddings").delete().eq("news_id", article_id).execute()
-                    except Exception:
-                        pass
+    # Articles go with their sources, and child rows cascade from those
+    result = client.rpc("delete_news_sources_by_names", {"names": indian_sources}).execute()
+    removed = result.data or []
+    for source in removed:
+        print(f"  Removed source: {source['name']}")
 
-                # Delete entity mentions
-                for article_id in article_ids:
-                    try:
-                        client.table("news_entity_mentions").delete().eq("news_id", article_id).execute()
-                    except Exception:
-                        pass
+    print(f"\nRemoved {len(removed)} Indian sources")
 
-                # Delete articles
-                client.table("news_articles").delete().eq("source_id", source_id).execute()
-                print(f"  Deleted {len(article_ids)} articles from {source_name}")
 
-            # Delete the source
-            client.table("news_sources").delete().eq("id", source_id).execute()
-            print(f"  Removed source: {source_name}")
-            removed += 1
-
-    print(f"\nRemoved {removed} Indian sources")
-
-
-def remove_articles_with_indian_content():
+def remove_articles_with_indian_content(verbose: bool = False):
     """Remove articles that have Indian-specific content."""
     client = get_supabase_service_client()
 
@@ -125,42 +83,27 @@ def remove_articles_with_indian_content():
 
     print("Scanning for articles with Indian-specific content...")
 
-    deleted = 0
-    for keyword in indian_keywords:
-        # Find articles with this keyword in title or summary
-        articles = client.table("news_articles").select("id, title").or_(
-            f"title.ilike.%{keyword}%,summary.ilike.%{keyword}%"
-        ).execute()
-
-        if articles.data:
-            for article in articles.data:
-                article_id = article["id"]
-
-                # Delete embeddings
-                try:
-                    client.table("news_embeddings").delete().eq("news_id", article_id).execute()
-                except Exception:
-                    pass
-
-                # Delete entity mentions
-                try:
-                    client.table("news_entity_mentions").delete().eq("news_id", article_id).execute()
-                except Exception:
-                    pass
+    # One full-text query over the indexed search_tsv column; multi-word
+    # keywords become phrase matches (see add_news_search.sql)
+    query = " | ".join(" <-> ".join(keyword.split()) for keyword in indian_keywords)
+    # Titles are only fetched back when they will be printed
+    result = client.rpc("delete_news_matching", {"q": query}).select(
+        "id, title" if verbose else "id"
+    ).execute()
 
-                # Delete article
-                client.table("news_articles").delete().eq("id", article_id).execute()
-                print(f"  Deleted: {article['title'][:50]}...")
-                deleted += 1
+    deleted = result.data or []
+    if verbose:
+        for article in deleted:
+            print(f"  Deleted: {article['title'][:50]}...")
 
-    print(f"\nDeleted {deleted} articles with Indian content")
+    print(f"\nDeleted {len(deleted)} articles with Indian content")
 
 
 def show_current_sources():
     """Display current news sources in the database."""
     client = get_supabase_service_client()
 
-    sources = client.table("news_sources").select("*").order("name").execute()
+    sources = client.table("news_sources").select("name, source_type, is_active").order("name").execute()
 
     print("\n=== Current News Sources ===")
     print(f"Total: {len(sources.data)} sources\n")
@@ -170,7 +113,7 @@ def show_current_sources():
         print(f"  {status} {source['name']} ({source.get('source_type', 'unknown')})")
 
 
-def main():
+def main(verbose: bool = False):
     print("=" * 50)
     print("NEWS CLEANUP UTILITY")
     print("=" * 50)
@@ -186,7 +129,7 @@ def main():
     print("\n" + "=" * 50)
     print("STEP 2: Removing articles with Indian content")
     print("=" * 50)
-    remove_articles_with_indian_content()
+    remove_articles_with_indian_content(verbose=verbose)
 
     print("\n" + "=" * 50)
     print("STEP 3: Cleaning up old articles (>30 days)")
@@ -202,4 +145,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="print the title of every deleted article",
+    )
+    args = parser.parse_args()
+    main(verbose=args.verbose)
@@ -6,134 +6,191 @@ Uses multiple sources:
 3. UI Avatars as fallback (generates letter-based logos)
 """
 import sys
+import re
+import json
+import socket
 import asyncio
+import argparse
 import httpx
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.db.supabase import get_supabase_service_client
 
+CONCURRENCY = 20  # simultaneous companies being probed
+
+# Resolved logo URLs by symbol, so later runs skip the domain probes
+CACHE_PATH = Path(__file__).with_suffix(".cache.json")
+CACHE_FLUSH_EVERY = 25  # new entries between writes
+
+UPSERT_BATCH_SIZE = 500
+
+DNS_TIMEOUT = 2.0  # seconds
+PROBE_TIMEOUT = httpx.Timeout(connect=1.0, read=2.0, write=1.0, pool=1.0)
+MIN_LOGO_BYTES = 500  # anything smaller is a tracking pixel, not a logo
+
+MIN_GUESSED_SYMBOL_LENGTH = 4  # shortest symbol worth guessing <symbol>.com for
+
 # Known company websites for major PSX stocks
-COMPANY_WEBSITES = {
+_COMPANY_WEBSITE_PAIRS = [
     # Banks
-    "HBL": "hbl.com",
-    "UBL": "ubldigital.com",
-    "MCB": "mcb.com.pk",
-    "ABL": "abl.com",
-    "MEBL": "meezanbank.com",
-    "NBP": "nbp.com.pk",
-    "BAFL": "bankalfalah.com",
-    "BAHL": "bankalhabib.com",
-    "FABL": "faysalbank.com",
-    "AKBL": "askaribank.com.pk",
-    "SNBL": "soneribank.com",
-    "JSBL": "jsbl.com",
-    "SILK": "silkbank.com.pk",
-    "BIPL": "bifreholdings.com",
+    ("HBL", "hbl.com"),
+    ("UBL", "ubldigital.com"),
+    ("MCB", "mcb.com.pk"),
+    ("ABL", "abl.com"),
+    ("MEBL", "meezanbank.com"),
+    ("NBP", "nbp.com.pk"),
+    ("BAFL", "bankalfalah.com"),
+    ("BAHL", "bankalhabib.com"),
+    ("FABL", "faysalbank.com"),
+    ("AKBL", "askaribank.com.pk"),
+    ("SNBL", "soneribank.com"),
+    ("JSBL", "jsbl.com"),
+    ("SILK", "silkbank.com.pk"),
+    ("BIPL", "bankislami.com.pk"),
 
     # Cement
-    "LUCK": "lucky-cement.com",
-    "DGKC": "dgcement.com",
-    "MLCF": "mapleleafcement.com",
-    "FCCL": "fauji.com.pk",
-    "KOHC": "kohatcement.com",
-    "CHCC": "charatcement.com",
-    "PIOC": "pioneercement.com",
-    "ACPL": "attockcement.com",
-    "BWCL": "bestway.com.pk",
+    ("LUCK", "lucky-cement.com"),
+    ("DGKC", "dgcement.com"),
+    ("MLCF", "mapleleafcement.com"),
+    ("FCCL", "fauji.com.pk"),
+    ("KOHC", "kohatcement.com"),
+    ("CHCC", "charatcement.com"),
+    ("PIOC", "pioneercement.com"),
+    ("ACPL", "attockcement.com"),
+    ("BWCL", "bestway.com.pk"),
 
     # Oil & Gas
-    "OGDC": "ogdcl.com",
-    "PPL": "ppl.com.pk",
-    "POL": "pakoil.com.pk",
-    "PSO": "psopk.com",
-    "SNGP": "ssgc.com.pk",
-    "SSGC": "ssgc.com.pk",
-    "MARI": "mari-gas.com.pk",
-    "ATRL": "attock.com",
-    "APL": "attock.com",
-    "NRL": "nfrpk.com",
-    "BYCO": "byco.com.pk",
-    "HASCOL": "hfreholdings.com",
+    ("OGDC", "ogdcl.com"),
+    ("PPL", "ppl.com.pk"),
+    ("POL", "pakoil.com.pk"),
+    ("PSO", "psopk.com"),
+    ("SNGP", "ssgc.com.pk"),
+    ("SSGC", "ssgc.com.pk"),
+    ("MARI", "mari-gas.com.pk"),
+    ("ATRL", "attock.com"),
+    ("APL", "attock.com"),
+    ("NRL", "nfrpk.com"),
+    ("BYCO", "byco.com.pk"),
+    ("HASCOL", "hascol.com"),
 
     # Technology
-    "SYS": "systemsltd.com",
-    "TRG": "trg.com.pk",
-    "AVN": "avanceon.com",
-    "NETSOL": "netsoltech.com",
+    ("SYS", "systemsltd.com"),
+    ("TRG", "trg.com.pk"),
+    ("AVN", "avanceon.com"),
+    ("NETSOL", "netsoltech.com"),
 
     # Telecom
-    "PTC": "ptcl.com.pk",
+    ("PTC", "ptcl.com.pk"),
 
     # Fertilizer
-    "EFERT": "engrofertilizers.com",
-    "FFC": "ffreholdings.com",
-    "FATIMA": "fatima-group.com",
-    "FFBL": "ffbl.com",
+    ("EFERT", "engrofertilizers.com"),
+    ("FFC", "ffc.com.pk"),
+    ("FATIMA", "fatima-group.com"),
+    ("FFBL", "ffbl.com"),
 
     # Power
-    "HUBC": "hubpower.com",
-    "KEL": "ke.com.pk",
-    "KAPCO": "kapco.com.pk",
-    "NPL": "nishatpower.com",
-    "NCPL": "nishat.net",
+    ("HUBC", "hubpower.com"),
+    ("KEL", "ke.com.pk"),
+    ("KAPCO", "kapco.com.pk"),
+    ("NPL", "nishatpower.com"),
+    ("NCPL", "nishat.net"),
 
     # Automobile
-    "INDU": "toyota-indus.com",
-    "HCAR": "honda.com.pk",
-    "PSMC": "suzukipakistan.com",
-    "MTL": "millat.com.pk",
-    "GHNL": "gfreholdings.com",
-    "AGTL": "agriautos.com",
+    ("INDU", "toyota-indus.com"),
+    ("HCAR", "honda.com.pk"),
+    ("PSMC", "suzukipakistan.com"),
+    ("MTL", "millat.com.pk"),
+    ("AGTL", "agriautos.com"),
 
     # Textile
-    "NML": "nishatmills.com",
-    "NCL": "nishat.net",
-    "GATM": "gfreholdings.com",
-    "ILP": "interlooppk.com",
+    ("NML", "nishatmills.com"),
+    ("NCL", "nishat.net"),
+    ("GATM", "gulahmed.com"),
+    ("ILP", "interlooppk.com"),
 
     # Food & Beverages
-    "NESTLE": "nestle.pk",
-    "UNITY": "unityfoodslimited.com",
-    "NATF": "nationalfoods.com",
-    "FFL": "frieslandcampina.com.pk",
-    "QUICE": "mitchellsfruit.com",
+    ("NESTLE", "nestle.pk"),
+    ("UNITY", "unityfoodslimited.com"),
+    ("NATF", "nationalfoods.com"),
+    ("FFL", "frieslandcampina.com.pk"),
+    ("QUICE", "mitchellsfruit.com"),
 
     # Pharma
-    "SEARL": "searlecompany.com",
-    "GLAXO": "pk.gsk.com",
-    "FEROZ": "ffreholdings.com",
-    "AGP": "agp.com.pk",
-    "HINOON": "hinoonsorganic.com",
+    ("SEARL", "searlecompany.com"),
+    ("GLAXO", "pk.gsk.com"),
+    ("FEROZ", "ferozsons-labs.com"),
+    ("AGP", "agp.com.pk"),
+    ("HINOON", "hinoonsorganic.com"),
 
     # Real Estate
-    "DCL": "dolmen.com.pk",
+    ("DCL", "dolmen.com.pk"),
 
     # Chemicals
-    "ENGRO": "engro.com",
-    "ICI": "akzonobel.com",
-    "LOTCHEM": "lfreholdings.com",
+    ("ENGRO", "engro.com"),
+    ("ICI", "akzonobel.com"),
 
     # Steel
-    "ISL": "ittehadsfreel.com",
-    "ASTL": "amarasteel.com",
-    "INIL": "internationalindustries.com",
-    "MUGHAL": "mughalsteel.com.pk",
+    ("ISL", "isl.com.pk"),
+    ("ASTL", "amarasteel.com"),
+    ("INIL", "internationalindustries.com"),
+    ("MUGHAL", "mughalsteel.com.pk"),
 
     # Insurance
-    "EFUG": "efugeneral.com",
-    "JSGCL": "jsgroup.com",
-    "AICL": "adamjeeinsurance.com",
+    ("EFUG", "efugeneral.com"),
+    ("JSGCL", "jsgroup.com"),
+    ("AICL", "adamjeeinsurance.com"),
 
     # Others
-    "ENGRO": "engro.com",
-    "COLG": "colgate.com.pk",
-    "ULEVER": "unilever.pk",
-    "PAEL": "pakelectron.com",
-    "WAVES": "waves.com.pk",
-    "DAWH": "dawood-group.com",
-}
+    ("COLG", "colgate.com.pk"),
+    ("ULEVER", "unilever.pk"),
+    ("PAEL", "pakelectron.com"),
+    ("WAVES", "waves.com.pk"),
+    ("DAWH", "dawood-group.com"),
+]
+
+_DOMAIN_RE = re.compile(r"[a-z0-9.-]+\.[a-z]{2,}")
+
+
+def _build_company_websites(pairs):
+    """Build the symbol -> domain map, refusing shadowed keys and malformed domains."""
+    websites = {}
+    for symbol, domain in pairs:
+        if symbol in websites:
+            raise ValueError(f"Duplicate COMPANY_WEBSITES entry for {symbol}")
+        if not _DOMAIN_RE.fullmatch(domain):
+            raise ValueError(f"Malformed domain for {symbol}: {domain!r}")
+        websites[symbol] = domain
+    return websites
+
+
+COMPANY_WEBSITES = _build_company_websites(_COMPANY_WEBSITE_PAIRS)
+
+
+async def domain_resolves(domain: str) -> bool:
+    """Check that a domain has a DNS record before paying for an HTTPS probe."""
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.wait_for(
+            loop.getaddrinfo(domain, 443, type=socket.SOCK_STREAM), DNS_TIMEOUT
+        )
+        return True
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+
+async def drop_unresolvable_websites() -> None:
+    """Remove COMPANY_WEBSITES entries whose domain does not resolve."""
+    domains = sorted(set(COMPANY_WEBSITES.values()))
+    alive = await asyncio.gather(*[domain_resolves(d) for d in domains])
+    dead = {domain for domain, ok in zip(domains, alive) if not ok}
+    for symbol, domain in list(COMPANY_WEBSITES.items()):
+        if domain in dead:
+            print(f"Ignoring known website for {symbol}: {domain} does not resolve")
+            del COMPANY_WEBSITES[symbol]
 
 
 def get_clearbit_logo_url(domain: str) -> str:
@@ -141,24 +198,47 @@ def get_clearbit_logo_url(domain: str) -> str:
     return f"https://logo.clearbit.com/{domain}"
 
 
+# One pre-formatted query suffix per background colour
+_AVATAR_SUFFIXES = tuple(
+    f"&background={color}&color=fff&size=128&bold=true&format=png"
+    for color in ("0ea5e9", "8b5cf6", "ec4899", "f97316", "22c55e", "06b6d4", "6366f1", "f43f5e")
+)
+
+
+@lru_cache(maxsize=None)
 def get_ui_avatar_url(symbol: str, name: str) -> str:
     """Generate a letter-based avatar as fallback."""
     # Use first letters of company name or symbol
     initials = symbol[:2].upper()
     # Generate a consistent color based on symbol
-    colors = ["0ea5e9", "8b5cf6", "ec4899", "f97316", "22c55e", "06b6d4", "6366f1", "f43f5e"]
-    color_index = sum(ord(c) for c in symbol) % len(colors)
-    bg_color = colors[color_index]
+    suffix = _AVATAR_SUFFIXES[sum(map(ord, symbol)) % len(_AVATAR_SUFFIXES)]
+
+    return f"https://ui-avatars.com/api/?name={initials}{suffix}"
+
+
+def load_logo_cache() -> Dict[str, str]:
+    """Load previously resolved logo URLs, or an empty cache."""
+    try:
+        return json.loads(CACHE_PATH.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
 
-    return f"https://ui-avatars.com/api/?name={initials}&background={bg_color}&color=fff&size=128&bold=true&format=png"
+
+def save_logo_cache(cache: Dict[str, str]) -> None:
+    CACHE_PATH.write_text(json.dumps(cache, indent=2, sort_keys=True))
 
 
 async def check_logo_exists(client: httpx.AsyncClient, url: str) -> bool:
     """Check if a logo URL returns a valid image."""
     try:
-        response = await client.head(url, timeout=5.0, follow_redirects=True)
+        # Only a direct 200 counts; redirects lead to fallback pages anyway
+        response = await client.head(url, timeout=PROBE_TIMEOUT, follow_redirects=False)
         content_type = response.headers.get("content-type", "")
-        return response.status_code == 200 and "image" in content_type
+        if response.status_code != 200 or "image" not in content_type:
+            return False
+        # Reject placeholder pixels, but don't require the header to be present
+        content_length = response.headers.get("content-length")
+        return content_length is None or int(content_length) >= MIN_LOGO_BYTES
     except Exception:
         return False
 
@@ -166,81 +246,129 @@ async def check_logo_exists(client: httpx.AsyncClient, url: str) -> bool:
 async def fetch_logo_for_company(
     client: httpx.AsyncClient,
     symbol: str,
-    name: str
+    name: str,
+    cache: Optional[Dict[str, str]] = None,
 ) -> str:
     """Fetch logo URL for a company, trying multiple sources."""
-
-    # Try Clearbit first if we have a known domain
-    if symbol in COMPANY_WEBSITES:
-        domain = COMPANY_WEBSITES[symbol]
-        clearbit_url = get_clearbit_logo_url(domain)
-        if await check_logo_exists(client, clearbit_url):
-            return clearbit_url
-
-    # Try to guess domain from company name
-    guessed_domains = [
-        f"{symbol.lower()}.com.pk",
-        f"{symbol.lower()}.com",
+    if cache is not None and symbol in cache:
+        cached = cache[symbol]
+        # A symbol that fell back to an avatar last time has no website worth
+        # probing again, unless one has since been added to COMPANY_WEBSITES
+        if symbol not in COMPANY_WEBSITES or "ui-avatars" not in cached:
+            return cached
+
+    # Known domain first, then guesses from the symbol and company name
+    known = [COMPANY_WEBSITES[symbol]] if symbol in COMPANY_WEBSITES else []
+    guessed = [f"{symbol.lower()}.com.pk"]
+    if len(symbol) >= MIN_GUESSED_SYMBOL_LENGTH:
+        # Short .com names almost always belong to some other brand
+        guessed.append(f"{symbol.lower()}.com")
+    guessed += [
         f"{name.lower().replace(' ', '')}.com.pk",
         f"{name.lower().replace(' ', '')}.com",
     ]
+    guessed = [d for d in dict.fromkeys(guessed) if d not in known and _DOMAIN_RE.fullmatch(d)]
 
-    for domain in guessed_domains:
-        clearbit_url = get_clearbit_logo_url(domain)
-        if await check_logo_exists(client, clearbit_url):
-            return clearbit_url
+    # Most guesses don't resolve, and a DNS miss is far cheaper than an HTTPS
+    # probe through Clearbit (known domains were checked at start-up)
+    resolves = await asyncio.gather(*[domain_resolves(d) for d in guessed])
+    domains = known + [d for d, ok in zip(guessed, resolves) if ok]
+    urls = [get_clearbit_logo_url(domain) for domain in domains]
+
+    # Probe all candidates at once; the earliest candidate that exists wins
+    found = await asyncio.gather(*[check_logo_exists(client, url) for url in urls])
+    for url, ok in zip(urls, found):
+        if ok:
+            return url
 
     # Fallback to UI Avatars (always works)
     return get_ui_avatar_url(symbol, name)
 
 
-async def update_company_logos():
+async def update_company_logos(refresh: bool = False):
     """Main function to fetch and update all company logos."""
     db = get_supabase_service_client()
+    cache = {} if refresh else load_logo_cache()
+    unsaved = 0
+    pending = []  # resolved rows, written in bulk once probing is done
 
     # Get all companies without logos or with placeholder logos
-    result = db.table("companies").select("id, symbol, name, logo_url").execute()
+    result = db.table("companies").select("id, market_id, symbol, name, logo_url").execute()
     companies = result.data or []
 
     print(f"Found {len(companies)} companies to process")
 
-    updated = 0
-    skipped = 0
+    await drop_unresolvable_websites()
 
-    async with httpx.AsyncClient() as client:
-        for company in companies:
-            symbol = company["symbol"]
-            name = company["name"]
-            current_logo = company.get("logo_url")
+    sem = asyncio.Semaphore(CONCURRENCY)
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
 
-            # Skip if already has a non-placeholder logo
-            if current_logo and "ui-avatars" not in current_logo and "placeholder" not in current_logo:
-                print(f"Skipping {symbol} - already has logo")
-                skipped += 1
-                continue
+    async def process(client: httpx.AsyncClient, company: dict) -> str:
+        nonlocal unsaved
+        symbol = company["symbol"]
+        name = company["name"]
+        current_logo = company.get("logo_url")
 
-            print(f"Fetching logo for {symbol} ({name})...", end=" ")
+        # Skip if already has a non-placeholder logo
+        if current_logo and "ui-avatars" not in current_logo and "placeholder" not in current_logo:
+            print(f"Skipping {symbol} - already has logo")
+            return "skipped"
 
+        async with sem:
             try:
-                logo_url = await fetch_logo_for_company(client, symbol, name)
-
-                # Update database
-                db.table("companies").update({
-                    "logo_url": logo_url
-                }).eq("id", company["id"]).execute()
+                logo_url = await fetch_logo_for_company(client, symbol, name, cache)
+                if cache.get(symbol) != logo_url:
+                    cache[symbol] = logo_url
+                    unsaved += 1
+                    if unsaved >= CACHE_FLUSH_EVERY:
+                        save_logo_cache(cache)
+                        unsaved = 0
+
+                if logo_url == current_logo:
+                    return "skipped"
+
+                # Upsert needs the NOT NULL columns even though the row exists
+                pending.append({
+                    "id": company["id"],
+                    "market_id": company["market_id"],
+                    "symbol": symbol,
+                    "name": name,
+                    "logo_url": logo_url,
+                })
 
                 logo_type = "Clearbit" if "clearbit" in logo_url else "UI Avatar"
-                print(f"OK ({logo_type})")
-                updated += 1
+                print(f"{symbol} ({name}): OK ({logo_type})")
+                return "resolved"
 
             except Exception as e:
-                print(f"Error: {e}")
+                print(f"{symbol} ({name}): Error: {e}")
+                return "failed"
+
+    async with httpx.AsyncClient(limits=limits) as client:
+        statuses = await asyncio.gather(*[process(client, c) for c in companies])
+
+    if unsaved:
+        save_logo_cache(cache)
+
+    updated = 0
+    for i in range(0, len(pending), UPSERT_BATCH_SIZE):
+        batch = pending[i:i + UPSERT_BATCH_SIZE]
+        try:
+            db.table("companies").upsert(batch, on_conflict="id").execute()
+            updated += len(batch)
+        except Exception as e:
+            print(f"Error saving logos (batch {i // UPSERT_BATCH_SIZE + 1}): {e}")
 
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(0.1)
+    skipped = statuses.count("skipped")
 
     print(f"\nSummary: {updated} updated, {skipped} skipped")
 
 
 if __name__ == "__main__":
-    asyncio.run(update_company_logos())
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--refresh", action="store_true",
+        help=f"ignore {CACHE_PATH.name} and probe every domain again",
+    )
+    args = parser.parse_args()
+    asyncio.run(update_company_logos(refresh=args.refresh))
@@ -4,15 +4,22 @@ This script fetches all stocks from PSX market watch and creates
 company + stock records for each one.
 """
 import asyncio
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.db.pg_pool import close_pool, get_pool
 from app.db.supabase import get_supabase_service_client
 from app.services.psx.dps_client import DPSPortalClient
 from app.services.psx.constants import PSX_SECTOR_CODES
 
+BATCH_SIZE = 500  # Max rows per Supabase request
+WRITE_CONCURRENCY = 8  # batches in flight at once
+
 
 # Map PSX sector codes to our internal sector codes (based on actual PSX DPS codes)
 PSX_CODE_TO_INTERNAL = {
@@ -105,59 +112,225 @@ SECTOR_NAME_MAPPING = {
     "LEASING COMPANIES": "MISC",
 }
 
+# Materialized once for the partial-match fallback below
+_SECTOR_ITEMS = tuple((name.upper(), code) for name, code in SECTOR_NAME_MAPPING.items())
+
+# Longest keys first so "OIL & GAS MARKETING COMPANIES" wins over "OIL & GAS MARKETING"
+_SECTOR_NAME_RE = re.compile(
+    "|".join(re.escape(key) for key in sorted(SECTOR_NAME_MAPPING, key=len, reverse=True))
+)
+
+
+@lru_cache(maxsize=256)
+def _sector_code_for_name(sector_upper: str) -> Optional[str]:
+    """Resolve an upper-cased PSX sector name to an internal sector code."""
+    # Direct mapping
+    if sector_upper in SECTOR_NAME_MAPPING:
+        return SECTOR_NAME_MAPPING[sector_upper]
+
+    # Partial match: a known name inside this one, or this one inside a known name
+    match = _SECTOR_NAME_RE.search(sector_upper)
+    if match:
+        return SECTOR_NAME_MAPPING[match.group(0)]
+    for key, code in _SECTOR_ITEMS:
+        if sector_upper in key:
+            return code
+
+    return None
+
 
-def get_market_id(client):
-    result = client.table("markets").select("id").eq("code", "PSX").execute()
-    return result.data[0]["id"] if result.data else None
+_PRICE_KEYS = ("current_price", "change_amount", "change_percentage")
 
 
-def get_sectors(client, market_id):
-    result = client.table("sectors").select("id, code").eq("market_id", market_id).execute()
-    return {s["code"]: s["id"] for s in result.data} if result.data else {}
+def _price_fields(stock_data, default):
+    """Price columns for a stocks row; missing or blank values become ``default``."""
+    fields = {key: _to_float(stock_data.get(key), default) for key in _PRICE_KEYS}
+    fields["previous_close"] = _to_float(stock_data.get("previous_close"), None)
+    return fields
 
 
-def get_sector_id(stock_data, sectors):
-    """Map sector from PSX to our sector code.
+def _to_float(value, default):
+    return default if value is None or value == "" else float(value)
 
-    First tries to use sector_code (4-digit PSX code),
-    then falls back to sector name matching.
+
+async def _write_batches(label, rows, write):
+    """Run write(batch) over BATCH_SIZE slices of rows in worker threads.
+
+    supabase-py is synchronous, so each batch goes to a thread; at most
+    WRITE_CONCURRENCY run at once. Returns the number of rows written.
     """
-    # Try sector code first (more reliable)
-    sector_code = stock_data.get("sector_code")
-    if sector_code and sector_code in PSX_CODE_TO_INTERNAL:
-        internal_code = PSX_CODE_TO_INTERNAL[sector_code]
-        if internal_code in sectors:
-            return sectors[internal_code]
+    sem = asyncio.Semaphore(WRITE_CONCURRENCY)
+
+    async def write_one(i):
+        batch = rows[i:i + BATCH_SIZE]
+        async with sem:
+            try:
+                await asyncio.to_thread(write, batch)
+                return len(batch)
+            except Exception as e:
+                print(f"Error {label} (batch {i // BATCH_SIZE + 1}): {e}")
+                return 0
 
-    # Fall back to sector name
-    sector_name = stock_data.get("sector", "")
-    if not sector_name:
-        return sectors.get("MISC")
+    written = await asyncio.gather(*[write_one(i) for i in range(0, len(rows), BATCH_SIZE)])
+    return sum(written)
 
-    sector_upper = sector_name.upper().strip()
 
-    # Direct mapping
-    if sector_upper in SECTOR_NAME_MAPPING:
-        code = SECTOR_NAME_MAPPING[sector_upper]
-        return sectors.get(code, sectors.get("MISC"))
+# Column order shared by the stock rows and the unnest() queries below
+_STOCK_PRICE_COLUMNS = ("current_price", "change_amount", "change_percentage", "previous_close", "volume")
+
 
-    # Partial match
-    for key, code in SECTOR_NAME_MAPPING.items():
-        if key in sector_upper or sector_upper in key:
-            return sectors.get(code, sectors.get("MISC"))
+def _stock_arrays(rows, key):
+    """Column arrays (key column first, then prices) for an unnest() query."""
+    return [[r[key] for r in rows]] + [[r[c] for r in rows] for c in _STOCK_PRICE_COLUMNS]
 
-    return sectors.get("MISC")
+
+async def _pg_create_companies(conn, market_id, rows):
+    """Insert companies in one statement; returns symbol -> id for every row.
+
+    Rows carry the raw PSX sector_code / sector name; the sector id is
+    resolved by the join below with the same precedence as
+    make_sector_resolver: PSX code, then exact name, then the longest
+    known name inside this one (or this one inside a known name), then MISC.
+    """
+    records = await conn.fetch(
+        """
+        WITH code_map AS (
+            SELECT * FROM unnest($5::text[], $6::text[]) AS m(psx_code, code)
+        ), name_map AS (
+            SELECT * FROM unnest($7::text[], $8::text[]) AS m(name, code)
+        ), staged AS (
+            SELECT u.symbol, u.name, u.sector_code, upper(trim(u.sector_name)) AS sector_name
+            FROM unnest($2::text[], $3::text[], $4::text[], $9::text[])
+                AS u(symbol, name, sector_code, sector_name)
+        )
+        INSERT INTO companies (market_id, sector_id, symbol, name, is_active)
+        SELECT $1::uuid, COALESCE(by_code.id, by_name.id, misc.id), s.symbol, s.name, true
+        FROM staged s
+        LEFT JOIN code_map cm ON cm.psx_code = s.sector_code
+        LEFT JOIN sectors by_code ON by_code.market_id = $1::uuid AND by_code.code = cm.code
+        LEFT JOIN LATERAL (
+            SELECT nm.code FROM name_map nm
+            WHERE s.sector_name <> ''
+              AND (strpos(s.sector_name, nm.name) > 0 OR strpos(nm.name, s.sector_name) > 0)
+            ORDER BY nm.name = s.sector_name DESC,
+                     strpos(s.sector_name, nm.name) > 0 DESC,
+                     length(nm.name) DESC
+            LIMIT 1
+        ) nm ON true
+        LEFT JOIN sectors by_name ON by_name.market_id = $1::uuid AND by_name.code = nm.code
+        LEFT JOIN sectors misc ON misc.market_id = $1::uuid AND misc.code = 'MISC'
+        ON CONFLICT (market_id, symbol) DO UPDATE
+        SET sector_id = EXCLUDED.sector_id, name = EXCLUDED.name, is_active = true
+        RETURNING id, symbol
+        """,
+        market_id,
+        [r["symbol"] for r in rows],
+        [r.get("name", r["symbol"]) for r in rows],
+        [r["sector_code"] for r in rows],
+        list(PSX_CODE_TO_INTERNAL),
+        list(PSX_CODE_TO_INTERNAL.values()),
+        list(SECTOR_NAME_MAPPING),
+        list(SECTOR_NAME_MAPPING.values()),
+        [r["sector"] or "" for r in rows],
+    )
+    return {rec["symbol"]: str(rec["id"]) for rec in records}
+
+
+async def _pg_insert_stocks(conn, rows):
+    await conn.execute(
+        """
+        INSERT INTO stocks (company_id, current_price, change_amount,
+                            change_percentage, previous_close, volume)
+        SELECT * FROM unnest($1::uuid[], $2::float8[], $3::float8[],
+                             $4::float8[], $5::float8[], $6::int8[])
+        """,
+        *_stock_arrays(rows, "company_id"),
+    )
+    return len(rows)
+
+
+async def _pg_update_stocks(conn, rows):
+    status = await conn.execute(
+        """
+        UPDATE stocks s SET
+            current_price = u.current_price,
+            change_amount = u.change_amount,
+            change_percentage = u.change_percentage,
+            previous_close = u.previous_close,
+            volume = u.volume
+        FROM unnest($1::uuid[], $2::float8[], $3::float8[],
+                    $4::float8[], $5::float8[], $6::int8[])
+            AS u(id, current_price, change_amount, change_percentage, previous_close, volume)
+        WHERE s.id = u.id
+        """,
+        *_stock_arrays(rows, "id"),
+    )
+    return int(status.split()[-1])
+
+
+def get_market_and_sectors(client):
+    """Return the PSX market id and its sector code -> id map in one request."""
+    result = client.table("markets").select("id, sectors(id, code)").eq("code", "PSX").execute()
+    if not result.data:
+        return None, {}
+    market = result.data[0]
+    return market["id"], {s["code"]: s["id"] for s in market.get("sectors") or []}
+
+
+def make_sector_resolver(sectors):
+    """Return get_sector_id(stock_data) bound to the market's sectors.
+
+    Resolution is memoized per (sector_code, sector name) pair; a full
+    market-watch has ~650 rows but only a few dozen distinct pairs.
+    """
+    misc_id = sectors.get("MISC")
+    # PSX code / known name -> sector id, so the common cases are one lookup
+    code_to_id = {
+        psx_code: sectors[internal]
+        for psx_code, internal in PSX_CODE_TO_INTERNAL.items()
+        if internal in sectors
+    }
+    name_to_id = {
+        name: sectors.get(internal, misc_id)
+        for name, internal in SECTOR_NAME_MAPPING.items()
+    }
+
+    @lru_cache(maxsize=None)
+    def resolve(sector_code, sector_name):
+        # Try sector code first (more reliable)
+        if sector_code in code_to_id:
+            return code_to_id[sector_code]
+
+        # Fall back to sector name
+        if not sector_name:
+            return misc_id
+
+        sector_upper = sector_name.upper().strip()
+        if sector_upper in name_to_id:
+            return name_to_id[sector_upper]
+
+        code = _sector_code_for_name(sector_upper)
+        return sectors.get(code, misc_id) if code else misc_id
+
+    def get_sector_id(stock_data):
+        """Map sector from PSX to our sector id.
+
+        First tries to use sector_code (4-digit PSX code),
+        then falls back to sector name matching.
+        """
+        return resolve(stock_data.get("sector_code"), stock_data.get("sector", ""))
+
+    return get_sector_id
 
 
 async def seed_all_stocks():
     client = get_supabase_service_client()
-    market_id = get_market_id(client)
+    market_id, sectors = get_market_and_sectors(client)
 
     if not market_id:
         print("ERROR: PSX market not found. Run seed_markets.py first.")
         return
 
-    sectors = get_sectors(client, market_id)
     if not sectors:
         print("ERROR: No sectors found. Run seed_markets.py first.")
         return
@@ -165,10 +338,18 @@ async def seed_all_stocks():
     print(f"Market ID: {market_id}")
     print(f"Found {len(sectors)} sectors")
 
-    # Fetch all stocks from PSX via DPS market-watch
+    # Fetch all stocks from PSX via DPS market-watch; the existing-companies
+    # read doesn't depend on it, so run it while the page downloads
     print("\nFetching PSX market watch...")
     dps = DPSPortalClient()
-    market_rows = await dps.fetch_market_watch()
+    market_rows, existing = await asyncio.gather(
+        dps.fetch_market_watch(),
+        asyncio.to_thread(
+            client.table("companies").select(
+                "id, symbol, stocks(id)"
+            ).eq("market_id", market_id).execute
+        ),
+    )
 
     if not market_rows:
         print("ERROR: No stocks fetched from PSX. Check internet connection.")
@@ -191,14 +372,20 @@ async def seed_all_stocks():
 
     print(f"Fetched {len(stocks)} stocks from PSX")
 
-    # Get existing companies
-    existing = client.table("companies").select("symbol").eq("market_id", market_id).execute()
-    existing_symbols = {c["symbol"] for c in existing.data} if existing.data else set()
-    print(f"Found {len(existing_symbols)} existing companies in database")
+    # Existing companies with their stock ids
+    symbol_to_id = {}
+    company_to_stock_id = {}
+    for c in existing.data or []:
+        symbol_to_id[c["symbol"]] = c["id"]
+        if c.get("stocks"):
+            company_to_stock_id[c["id"]] = c["stocks"][0]["id"]
+    existing_count = len(symbol_to_id)
+    print(f"Found {existing_count} existing companies in database")
 
-    created_count = 0
-    updated_count = 0
     skipped_count = 0
+    new_companies = {}  # symbol -> scraped row for companies not in the DB yet
+    new_stock_data = []  # scraped rows whose stock record doesn't exist yet
+    stock_updates = []
 
     for stock_data in stocks:
         symbol = stock_data.get("symbol")
@@ -206,73 +393,105 @@ async def seed_all_stocks():
             skipped_count += 1
             continue
 
-        # Get sector from scraped data (using code or name)
-        sector_id = get_sector_id(stock_data, sectors)
-
-        if symbol in existing_symbols:
+        company_id = symbol_to_id.get(symbol)
+        stock_id = company_to_stock_id.get(company_id)
+        if stock_id:
             # Update existing stock price
-            try:
-                company_result = client.table("companies").select("id").eq(
-                    "market_id", market_id
-                ).eq("symbol", symbol).execute()
-
-                if company_result.data:
-                    company_id = company_result.data[0]["id"]
-
-                    # Update stock
-                    client.table("stocks").update({
-                        "current_price": float(stock_data["current_price"]) if stock_data.get("current_price") else None,
-                        "change_amount": float(stock_data["change_amount"]) if stock_data.get("change_amount") else None,
-                        "change_percentage": float(stock_data["change_percentage"]) if stock_data.get("change_percentage") else None,
-                        "previous_close": float(stock_data["previous_close"]) if stock_data.get("previous_close") else None,
-                        "volume": stock_data.get("volume"),
-                    }).eq("company_id", company_id).execute()
-
-                    updated_count += 1
-            except Exception as e:
-                print(f"Error updating {symbol}: {e}")
-                skipped_count += 1
-        else:
-            # Create new company and stock
-            try:
-                company_data = {
-                    "market_id": market_id,
-                    "sector_id": sector_id,
-                    "symbol": symbol,
-                    "name": stock_data.get("name", symbol),
-                    "is_active": True,
-                }
-
-                result = client.table("companies").insert(company_data).execute()
-
-                if result.data:
-                    company_id = result.data[0]["id"]
-
-                    # Create stock record
-                    client.table("stocks").insert({
-                        "company_id": company_id,
-                        "current_price": float(stock_data["current_price"]) if stock_data.get("current_price") else 0,
-                        "change_amount": float(stock_data["change_amount"]) if stock_data.get("change_amount") else 0,
-                        "change_percentage": float(stock_data["change_percentage"]) if stock_data.get("change_percentage") else 0,
-                        "previous_close": float(stock_data["previous_close"]) if stock_data.get("previous_close") else None,
-                        "volume": stock_data.get("volume", 0),
-                    }).execute()
-
-                    created_count += 1
-
-                    if created_count % 50 == 0:
-                        print(f"  Created {created_count} new companies...")
+            stock_updates.append({
+                "id": stock_id,
+                "company_id": company_id,
+                **_price_fields(stock_data, default=None),
+                "volume": stock_data.get("volume"),
+            })
+            continue
 
-            except Exception as e:
-                print(f"Error creating {symbol}: {e}")
-                skipped_count += 1
+        if not company_id:
+            new_companies[symbol] = stock_data
+        new_stock_data.append(stock_data)
+
+    # With DATABASE_URL set, write over one pooled Postgres connection
+    # (a statement per table) instead of batched PostgREST requests
+    pool = await get_pool()
+
+    # Create new companies, then pick up their ids for the stock rows
+    if pool is not None:
+        # Sector ids are resolved by the INSERT itself
+        try:
+            async with pool.acquire() as conn:
+                created = await _pg_create_companies(conn, market_id, list(new_companies.values()))
+            symbol_to_id.update(created)
+            created_count = len(created)
+        except Exception as e:
+            print(f"Error creating companies: {e}")
+            created_count = 0
+    else:
+        # Get sector from scraped data (using code or name)
+        get_sector_id = make_sector_resolver(sectors)
+        company_rows = [
+            {
+                "market_id": market_id,
+                "sector_id": get_sector_id(stock_data),
+                "symbol": symbol,
+                "name": stock_data.get("name", symbol),
+                "is_active": True,
+            }
+            for symbol, stock_data in new_companies.items()
+        ]
+
+        def create_companies(batch):
+            result = client.table("companies").upsert(
+                batch, on_conflict="market_id,symbol"
+            ).execute()
+            for c in result.data or []:
+                symbol_to_id[c["symbol"]] = c["id"]
+
+        created_count = await _write_batches("creating companies", company_rows, create_companies)
+
+    stock_inserts = []
+    for stock_data in new_stock_data:
+        company_id = symbol_to_id.get(stock_data["symbol"])
+        if not company_id:
+            skipped_count += 1
+            continue
+        stock_inserts.append({
+            "company_id": company_id,
+            **_price_fields(stock_data, default=0),
+            "volume": stock_data.get("volume", 0),
+        })
+
+    if pool is not None:
+        inserted_count = updated_count = 0
+        try:
+            async with pool.acquire() as conn, conn.transaction():
+                if stock_inserts:
+                    inserted_count = await _pg_insert_stocks(conn, stock_inserts)
+                if stock_updates:
+                    updated_count = await _pg_update_stocks(conn, stock_updates)
+        except Exception as e:
+            print(f"Error writing stocks: {e}")
+            inserted_count = updated_count = 0
+        await close_pool()
+    else:
+        # Create stock records and update existing stocks side by side
+        inserted_count, updated_count = await asyncio.gather(
+            _write_batches(
+                "creating stocks", stock_inserts,
+                lambda batch: client.table("stocks").insert(batch).execute(),
+            ),
+            _write_batches(
+                "updating stocks", stock_updates,
+                lambda batch: client.table("stocks").upsert(batch, on_conflict="id").execute(),
+            ),
+        )
+    skipped_count += len(stock_inserts) - inserted_count
+    skipped_count += len(stock_updates) - updated_count
 
     print(f"\n{'='*50}")
     print(f"Seed completed!")
     print(f"  Created: {created_count} new companies")
     print(f"  Updated: {updated_count} existing stocks")
     print(f"  Skipped: {skipped_count}")
-    print(f"  Total in DB: {len(existing_symbols) + created_count}")
+    print(f"  Total in DB: {existing_count + created_count}")
 
 
 def main():
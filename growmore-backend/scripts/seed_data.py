@@ -0,0 +1,264 @@
+"""
+Reference data shared by the seed scripts.
+
+Rows are read-only mappings; pass ``dict(row)`` to the Supabase client.
+"""
+from types import MappingProxyType
+
+
+MARKETS = tuple(map(MappingProxyType, [
+    {
+        "code": "PSX",
+        "name": "Pakistan Stock Exchange",
+        "country": "Pakistan",
+        "country_code": "PK",
+        "currency": "PKR",
+        "currency_symbol": "Rs",
+        "timezone": "Asia/Karachi",
+        "trading_hours": {
+            "open": "09:30",
+            "close": "15:30",
+            "pre_market": "09:15",
+            "days": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+        },
+        "is_active": True,
+    },
+]))
+
+
+SECTORS = tuple(map(MappingProxyType, [
+    {"code": "AUTO", "name": "Automobile Assembler"},
+    {"code": "AUTOPART", "name": "Automobile Parts & Accessories"},
+    {"code": "BANK", "name": "Commercial Banks"},
+    {"code": "CEMENT", "name": "Cement"},
+    {"code": "CHEM", "name": "Chemical"},
+    {"code": "ENGG", "name": "Engineering"},
+    {"code": "FERT", "name": "Fertilizer"},
+    {"code": "FOOD", "name": "Food & Personal Care Products"},
+    {"code": "GLASS", "name": "Glass & Ceramics"},
+    {"code": "INS", "name": "Insurance"},
+    {"code": "INVBANK", "name": "Investment Banks"},
+    {"code": "LEATHER", "name": "Leather & Tanneries"},
+    {"code": "MISC", "name": "Miscellaneous"},
+    {"code": "OIL", "name": "Oil & Gas Exploration Companies"},
+    {"code": "OILMKT", "name": "Oil & Gas Marketing Companies"},
+    {"code": "PAPER", "name": "Paper & Board"},
+    {"code": "PHARMA", "name": "Pharmaceuticals"},
+    {"code": "POWER", "name": "Power Generation & Distribution"},
+    {"code": "PROP", "name": "Property"},
+    {"code": "REF", "name": "Refinery"},
+    {"code": "SUGAR", "name": "Sugar Allied Industries"},
+    {"code": "SYNTH", "name": "Synthetic & Rayon"},
+    {"code": "TECH", "name": "Technology & Communication"},
+    {"code": "TEXTILE", "name": "Textile Composite"},
+    {"code": "TEXSPIN", "name": "Textile Spinning"},
+    {"code": "TEXWEAVE", "name": "Textile Weaving"},
+    {"code": "TOBACCO", "name": "Tobacco"},
+    {"code": "TRANS", "name": "Transport"},
+]))
+
+
+COMMODITY_TYPES = tuple(map(MappingProxyType, [
+    {"name": "Gold 24K", "category": "gold", "unit": "tola", "icon": "gold"},
+    {"name": "Gold 22K", "category": "gold", "unit": "tola", "icon": "gold"},
+    {"name": "Gold 21K", "category": "gold", "unit": "tola", "icon": "gold"},
+    {"name": "Gold 18K", "category": "gold", "unit": "tola", "icon": "gold"},
+    {"name": "Silver", "category": "silver", "unit": "tola", "icon": "silver"},
+    {"name": "Crude Oil", "category": "oil", "unit": "barrel", "icon": "oil"},
+]))
+
+
+NEWS_SOURCES = tuple(map(MappingProxyType, [
+    # Pakistan News Sources
+    {
+        "name": "Business Recorder",
+        "base_url": "https://www.brecorder.com",
+        "source_type": "news",
+        "reliability_score": 0.85,
+        "is_active": True,
+    },
+    {
+        "name": "Dawn Business",
+        "base_url": "https://www.dawn.com",
+        "source_type": "news",
+        "reliability_score": 0.9,
+        "is_active": True,
+    },
+    {
+        "name": "Express Tribune",
+        "base_url": "https://tribune.com.pk",
+        "source_type": "news",
+        "reliability_score": 0.8,
+        "is_active": True,
+    },
+    {
+        "name": "Geo News Business",
+        "base_url": "https://www.geo.tv",
+        "source_type": "news",
+        "reliability_score": 0.75,
+        "is_active": True,
+    },
+    # Reddit - commented out, pending API approval
+    {
+        "name": "Reddit Pakistan Finance",
+        "base_url": "https://reddit.com",
+        "source_type": "social",
+        "reliability_score": 0.5,
+        "is_active": False,  # Disabled - pending API approval
+    },
+    # Hacker News - No API key needed
+    {
+        "name": "Hacker News",
+        "base_url": "https://news.ycombinator.com",
+        "source_type": "community",
+        "reliability_score": 0.7,
+        "is_active": True,
+    },
+    # RSS Aggregator Sources
+    {
+        "name": "RSS Aggregator",
+        "base_url": "https://rss.feeds",
+        "source_type": "rss",
+        "reliability_score": 0.75,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - Reuters Business",
+        "base_url": "https://feeds.reuters.com",
+        "source_type": "rss",
+        "reliability_score": 0.9,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - BBC Business",
+        "base_url": "https://feeds.bbci.co.uk",
+        "source_type": "rss",
+        "reliability_score": 0.9,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - Seeking Alpha",
+        "base_url": "https://seekingalpha.com",
+        "source_type": "rss",
+        "reliability_score": 0.7,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - MarketWatch",
+        "base_url": "https://www.marketwatch.com",
+        "source_type": "rss",
+        "reliability_score": 0.8,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - CoinTelegraph",
+        "base_url": "https://cointelegraph.com",
+        "source_type": "rss",
+        "reliability_score": 0.65,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - CoinDesk",
+        "base_url": "https://www.coindesk.com",
+        "source_type": "rss",
+        "reliability_score": 0.7,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - Kitco Gold",
+        "base_url": "https://www.kitco.com",
+        "source_type": "rss",
+        "reliability_score": 0.8,
+        "is_active": True,
+    },
+    # Pakistan RSS Sources
+    {
+        "name": "Pakistan Finance RSS",
+        "base_url": "https://pakistan.rss",
+        "source_type": "rss",
+        "reliability_score": 0.8,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - Business Recorder RSS",
+        "base_url": "https://www.brecorder.com/feeds",
+        "source_type": "rss",
+        "reliability_score": 0.85,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - Dawn Business RSS",
+        "base_url": "https://www.dawn.com/feeds",
+        "source_type": "rss",
+        "reliability_score": 0.9,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - Tribune Business RSS",
+        "base_url": "https://tribune.com.pk/feed",
+        "source_type": "rss",
+        "reliability_score": 0.8,
+        "is_active": True,
+    },
+    {
+        "name": "RSS - Economic Times",
+        "base_url": "https://economictimes.indiatimes.com",
+        "source_type": "rss",
+        "reliability_score": 0.75,
+        "is_active": True,
+    },
+]))
+
+
+# Scraper/RSS sources seeded by seed_news_sources.py (name, base_url, source_type, is_active)
+NEWS_FEED_SOURCES = tuple(map(MappingProxyType, [
+    # ===== Direct Scrapers (Website Type) =====
+    {"name": "Business Recorder", "base_url": "https://www.brecorder.com", "source_type": "website", "is_active": True},
+    {"name": "Dawn Business", "base_url": "https://www.dawn.com", "source_type": "website", "is_active": True},
+    {"name": "Tribune Business", "base_url": "https://tribune.com.pk", "source_type": "website", "is_active": True},
+    {"name": "Geo Business", "base_url": "https://www.geo.tv", "source_type": "website", "is_active": True},
+    {"name": "Express Tribune", "base_url": "https://tribune.com.pk", "source_type": "website", "is_active": True},
+    {"name": "The News", "base_url": "https://www.thenews.com.pk", "source_type": "website", "is_active": True},
+    {"name": "ARY News", "base_url": "https://arynews.tv", "source_type": "website", "is_active": True},
+    {"name": "Profit Pakistan", "base_url": "https://profit.pakistantoday.com.pk", "source_type": "website", "is_active": True},
+    {"name": "ProPakistani", "base_url": "https://propakistani.pk", "source_type": "website", "is_active": True},
+    {"name": "Samaa TV", "base_url": "https://www.samaa.tv", "source_type": "website", "is_active": True},
+    {"name": "Dunya News", "base_url": "https://dunyanews.tv", "source_type": "website", "is_active": True},
+    {"name": "Bol News", "base_url": "https://www.bolnews.com", "source_type": "website", "is_active": True},
+    {"name": "Daily Express", "base_url": "https://www.express.pk", "source_type": "website", "is_active": True},
+    {"name": "The Nation", "base_url": "https://www.nation.com.pk", "source_type": "website", "is_active": True},
+    {"name": "Pakistan Observer", "base_url": "https://pakobserver.net", "source_type": "website", "is_active": True},
+
+    # ===== Pakistan RSS Sources =====
+    {"name": "RSS - Business Recorder", "base_url": "https://www.brecorder.com/feeds/latest-news", "source_type": "rss", "is_active": True},
+    {"name": "RSS - Dawn Business", "base_url": "https://www.dawn.com/feeds/business", "source_type": "rss", "is_active": True},
+    {"name": "RSS - Tribune Business", "base_url": "https://tribune.com.pk/feed/business", "source_type": "rss", "is_active": True},
+    {"name": "RSS - Geo Business", "base_url": "https://www.geo.tv/rss/1/53", "source_type": "rss", "is_active": True},
+    {"name": "RSS - ARY Business", "base_url": "https://arynews.tv/category/business/feed/", "source_type": "rss", "is_active": True},
+    {"name": "RSS - The News Business", "base_url": "https://www.thenews.com.pk/rss/1/8", "source_type": "rss", "is_active": True},
+    {"name": "RSS - ProPakistani", "base_url": "https://propakistani.pk/feed/", "source_type": "rss", "is_active": True},
+    {"name": "RSS - Profit Pakistan", "base_url": "https://profit.pakistantoday.com.pk/feed/", "source_type": "rss", "is_active": True},
+    {"name": "RSS - Samaa Money", "base_url": "https://www.samaa.tv/money/feed/", "source_type": "rss", "is_active": True},
+    {"name": "RSS - Dunya News Business", "base_url": "https://dunyanews.tv/en/Business/rss", "source_type": "rss", "is_active": True},
+    {"name": "RSS - Bol News Business", "base_url": "https://www.bolnews.com/business/feed/", "source_type": "rss", "is_active": True},
+    {"name": "RSS - Daily Express", "base_url": "https://www.express.pk/feed/", "source_type": "rss", "is_active": True},
+    {"name": "RSS - The Nation Business", "base_url": "https://www.nation.com.pk/rss/business", "source_type": "rss", "is_active": True},
+    {"name": "RSS - Pakistan Observer", "base_url": "https://pakobserver.net/feed/", "source_type": "rss", "is_active": True},
+
+    # ===== International Sources (For Global Context) =====
+    {"name": "RSS - Reuters Business", "base_url": "https://feeds.reuters.com/reuters/businessNews", "source_type": "rss", "is_active": True},
+    {"name": "RSS - BBC Business", "base_url": "https://feeds.bbci.co.uk/news/business/rss.xml", "source_type": "rss", "is_active": True},
+    {"name": "RSS - Bloomberg Asia", "base_url": "https://www.bloomberg.com/markets/rss/asia.xml", "source_type": "rss", "is_active": True},
+
+    # ===== Commodities (Gold/Silver - Important for Pakistan) =====
+    {"name": "RSS - Kitco Gold", "base_url": "https://www.kitco.com/rss/kitco.rss", "source_type": "rss", "is_active": True},
+
+    # ===== Crypto Sources =====
+    {"name": "RSS - CoinTelegraph", "base_url": "https://cointelegraph.com/rss", "source_type": "rss", "is_active": True},
+    {"name": "RSS - CoinDesk", "base_url": "https://www.coindesk.com/arc/outboundfeeds/rss/", "source_type": "rss", "is_active": True},
+
+    # ===== Aggregator Sources =====
+    {"name": "RSS Aggregator", "base_url": "https://feeds.reuters.com", "source_type": "aggregator", "is_active": True},
+    {"name": "Pakistan Finance RSS", "base_url": "https://www.brecorder.com", "source_type": "aggregator", "is_active": True},
+    {"name": "Hacker News", "base_url": "https://news.ycombinator.com", "source_type": "api", "is_active": True},
+]))
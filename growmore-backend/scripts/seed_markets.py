@@ -5,34 +5,25 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.db.supabase import get_supabase_service_client
+from seed_data import COMMODITY_TYPES, MARKETS, NEWS_SOURCES, SECTORS
 
 
-def seed_markets():
-    client = get_supabase_service_client()
+def _insert_missing(client, table, rows, on_conflict):
+    """Insert the rows that don't exist yet in one request.
+
+    Existing rows are left untouched (ON CONFLICT DO NOTHING); returns the
+    names of the rows that were created.
+    """
+    result = client.table(table).upsert(
+        [dict(row) for row in rows], on_conflict=on_conflict, ignore_duplicates=True, default_to_null=False
+    ).execute()
+    return {row["name"] for row in result.data or []}
 
-    markets = [
-        {
-            "code": "PSX",
-            "name": "Pakistan Stock Exchange",
-            "country": "Pakistan",
-            "country_code": "PK",
-            "currency": "PKR",
-            "currency_symbol": "Rs",
-            "timezone": "Asia/Karachi",
-            "trading_hours": {
-                "open": "09:30",
-                "close": "15:30",
-                "pre_market": "09:15",
-                "days": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
-            },
-            "is_active": True,
-        },
-    ]
 
-    for market in markets:
-        existing = client.table("markets").select("id").eq("code", market["code"]).execute()
-        if not existing.data:
-            result = client.table("markets").insert(market).execute()
+def seed_markets(client):
+    created = _insert_missing(client, "markets", MARKETS, on_conflict="code")
+    for market in MARKETS:
+        if market["name"] in created:
             print(f"Created market: {market['name']}")
         else:
             print(f"Market already exists: {market['name']}")
@@ -40,237 +31,54 @@ def seed_markets():
     return client.table("markets").select("id").eq("code", "PSX").execute().data[0]["id"]
 
 
-def seed_sectors(market_id: str):
-    client = get_supabase_service_client()
-
-    sectors = [
-        {"code": "AUTO", "name": "Automobile Assembler"},
-        {"code": "AUTOPART", "name": "Automobile Parts & Accessories"},
-        {"code": "BANK", "name": "Commercial Banks"},
-        {"code": "CEMENT", "name": "Cement"},
-        {"code": "CHEM", "name": "Chemical"},
-        {"code": "ENGG", "name": "Engineering"},
-        {"code": "FERT", "name": "Fertilizer"},
-        {"code": "FOOD", "name": "Food & Personal Care Products"},
-        {"code": "GLASS", "name": "Glass & Ceramics"},
-        {"code": "INS", "name": "Insurance"},
-        {"code": "INVBANK", "name": "Investment Banks"},
-        {"code": "LEATHER", "name": "Leather & Tanneries"},
-        {"code": "MISC", "name": "Miscellaneous"},
-        {"code": "OIL", "name": "Oil & Gas Exploration Companies"},
-        {"code": "OILMKT", "name": "Oil & Gas Marketing Companies"},
-        {"code": "PAPER", "name": "Paper & Board"},
-        {"code": "PHARMA", "name": "Pharmaceuticals"},
-        {"code": "POWER", "name": "Power Generation & Distribution"},
-        {"code": "PROP", "name": "Property"},
-        {"code": "REF", "name": "Refinery"},
-        {"code": "SUGAR", "name": "Sugar Allied Industries"},
-        {"code": "SYNTH", "name": "Synthetic & Rayon"},
-        {"code": "TECH", "name": "Technology & Communication"},
-        {"code": "TEXTILE", "name": "Textile Composite"},
-        {"code": "TEXSPIN", "name": "Textile Spinning"},
-        {"code": "TEXWEAVE", "name": "Textile Weaving"},
-        {"code": "TOBACCO", "name": "Tobacco"},
-        {"code": "TRANS", "name": "Transport"},
-    ]
+def seed_sectors(client, market_id: str):
+    sectors = [{**sector, "market_id": market_id} for sector in SECTORS]
 
-    for sector in sectors:
-        sector["market_id"] = market_id
-        existing = client.table("sectors").select("id").eq("market_id", market_id).eq("code", sector["code"]).execute()
-        if not existing.data:
-            client.table("sectors").insert(sector).execute()
+    created = _insert_missing(client, "sectors", sectors, on_conflict="market_id,code")
+    for sector in SECTORS:
+        if sector["name"] in created:
             print(f"Created sector: {sector['name']}")
         else:
             print(f"Sector already exists: {sector['name']}")
 
 
-def seed_commodity_types():
-    client = get_supabase_service_client()
-
-    commodity_types = [
-        {"name": "Gold 24K", "category": "gold", "unit": "tola", "icon": "gold"},
-        {"name": "Gold 22K", "category": "gold", "unit": "tola", "icon": "gold"},
-        {"name": "Gold 21K", "category": "gold", "unit": "tola", "icon": "gold"},
-        {"name": "Gold 18K", "category": "gold", "unit": "tola", "icon": "gold"},
-        {"name": "Silver", "category": "silver", "unit": "tola", "icon": "silver"},
-        {"name": "Crude Oil", "category": "oil", "unit": "barrel", "icon": "oil"},
-    ]
-
-    for ct in commodity_types:
-        existing = client.table("commodity_types").select("id").eq("name", ct["name"]).execute()
-        if not existing.data:
-            client.table("commodity_types").insert(ct).execute()
+def seed_commodity_types(client):
+    created = _insert_missing(client, "commodity_types", COMMODITY_TYPES, on_conflict="name")
+    for ct in COMMODITY_TYPES:
+        if ct["name"] in created:
             print(f"Created commodity type: {ct['name']}")
         else:
             print(f"Commodity type already exists: {ct['name']}")
 
 
-def seed_news_sources():
-    client = get_supabase_service_client()
-
-    sources = [
-        # Pakistan News Sources
-        {
-            "name": "Business Recorder",
-            "base_url": "https://www.brecorder.com",
-            "source_type": "news",
-            "reliability_score": 0.85,
-            "is_active": True,
-        },
-        {
-            "name": "Dawn Business",
-            "base_url": "https://www.dawn.com",
-            "source_type": "news",
-            "reliability_score": 0.9,
-            "is_active": True,
-        },
-        {
-            "name": "Express Tribune",
-            "base_url": "https://tribune.com.pk",
-            "source_type": "news",
-            "reliability_score": 0.8,
-            "is_active": True,
-        },
-        {
-            "name": "Geo News Business",
-            "base_url": "https://www.geo.tv",
-            "source_type": "news",
-            "reliability_score": 0.75,
-            "is_active": True,
-        },
-        # Reddit - commented out, pending API approval
-        {
-            "name": "Reddit Pakistan Finance",
-            "base_url": "https://reddit.com",
-            "source_type": "social",
-            "reliability_score": 0.5,
-            "is_active": False,  # Disabled - pending API approval
-        },
-        # Hacker News - No API key needed
-        {
-            "name": "Hacker News",
-            "base_url": "https://news.ycombinator.com",
-            "source_type": "community",
-            "reliability_score": 0.7,
-            "is_active": True,
-        },
-        # RSS Aggregator Sources
-        {
-            "name": "RSS Aggregator",
-            "base_url": "https://rss.feeds",
-            "source_type": "rss",
-            "reliability_score": 0.75,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - Reuters Business",
-            "base_url": "https://feeds.reuters.com",
-            "source_type": "rss",
-            "reliability_score": 0.9,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - BBC Business",
-            "base_url": "https://feeds.bbci.co.uk",
-            "source_type": "rss",
-            "reliability_score": 0.9,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - Seeking Alpha",
-            "base_url": "https://seekingalpha.com",
-            "source_type": "rss",
-            "reliability_score": 0.7,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - MarketWatch",
-            "base_url": "https://www.marketwatch.com",
-            "source_type": "rss",
-            "reliability_score": 0.8,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - CoinTelegraph",
-            "base_url": "https://cointelegraph.com",
-            "source_type": "rss",
-            "reliability_score": 0.65,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - CoinDesk",
-            "base_url": "https://www.coindesk.com",
-            "source_type": "rss",
-            "reliability_score": 0.7,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - Kitco Gold",
-            "base_url": "https://www.kitco.com",
-            "source_type": "rss",
-            "reliability_score": 0.8,
-            "is_active": True,
-        },
-        # Pakistan RSS Sources
-        {
-            "name": "Pakistan Finance RSS",
-            "base_url": "https://pakistan.rss",
-            "source_type": "rss",
-            "reliability_score": 0.8,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - Business Recorder RSS",
-            "base_url": "https://www.brecorder.com/feeds",
-            "source_type": "rss",
-            "reliability_score": 0.85,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - Dawn Business RSS",
-            "base_url": "https://www.dawn.com/feeds",
-            "source_type": "rss",
-            "reliability_score": 0.9,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - Tribune Business RSS",
-            "base_url": "https://tribune.com.pk/feed",
-            "source_type": "rss",
-            "reliability_score": 0.8,
-            "is_active": True,
-        },
-        {
-            "name": "RSS - Economic Times",
-            "base_url": "https://economictimes.indiatimes.com",
-            "source_type": "rss",
-            "reliability_score": 0.75,
-            "is_active": True,
-        },
-    ]
-
-    for source in sources:
-        existing = client.table("news_sources").select("id").eq("name", source["name"]).execute()
-        if not existing.data:
-            client.table("news_sources").insert(source).execute()
+def seed_news_sources(client):
+    created = _insert_missing(client, "news_sources", NEWS_SOURCES, on_conflict="name")
+    for source in NEWS_SOURCES:
+        if source["name"] in created:
             print(f"Created news source: {source['name']}")
         else:
             print(f"News source already exists: {source['name']}")
 
 
-def main():
-    print("Starting market seed...")
-    market_id = seed_markets()
-    print(f"Market ID: {market_id}")
+async def seed_all(client):
+    # Only sectors depend on another phase (the PSX market id); the rest are
+    # independent requests, so run them side by side
+    async def seed_market_and_sectors():
+        market_id = await asyncio.to_thread(seed_markets, client)
+        print(f"Market ID: {market_id}")
+        await asyncio.to_thread(seed_sectors, client, market_id)
 
-    print("\nSeeding sectors...")
-    seed_sectors(market_id)
+    await asyncio.gather(
+        seed_market_and_sectors(),
+        asyncio.to_thread(seed_commodity_types, client),
+        asyncio.to_thread(seed_news_sources, client),
+    )
 
-    print("\nSeeding commodity types...")
-    seed_commodity_types()
 
-    print("\nSeeding news sources...")
-    seed_news_sources()
+def main():
+    print("Starting market seed...")
+    client = get_supabase_service_client()
+    asyncio.run(seed_all(client))
 
     print("\nSeed completed!")
 
@@ -1,120 +1,201 @@
+import asyncio
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.db.pg_pool import close_pool, get_pool
 from app.db.supabase import get_supabase_service_client
 
 
-def get_market_id():
-    client = get_supabase_service_client()
+# (symbol, name, sector code)
+SAMPLE_COMPANIES = (
+    ("HBL", "Habib Bank Limited", "BANK"),
+    ("UBL", "United Bank Limited", "BANK"),
+    ("MCB", "MCB Bank Limited", "BANK"),
+    ("ABL", "Allied Bank Limited", "BANK"),
+    ("MEBL", "Meezan Bank Limited", "BANK"),
+    ("LUCK", "Lucky Cement Limited", "CEMENT"),
+    ("DGKC", "D.G. Khan Cement Company Limited", "CEMENT"),
+    ("MLCF", "Maple Leaf Cement Factory Limited", "CEMENT"),
+    ("OGDC", "Oil & Gas Development Company Limited", "OIL"),
+    ("PPL", "Pakistan Petroleum Limited", "OIL"),
+    ("POL", "Pakistan Oilfields Limited", "OIL"),
+    ("SYS", "Systems Limited", "TECH"),
+    ("TRG", "TRG Pakistan Limited", "TECH"),
+)
+
+# (commodity type, name, price_per_unit)
+SAMPLE_COMMODITIES = (
+    ("Gold 24K", "Gold 24K (Per Tola)", "per tola"),
+    ("Gold 24K", "Gold 24K (Per 10 Grams)", "per 10 grams"),
+    ("Gold 22K", "Gold 22K (Per Tola)", "per tola"),
+    ("Gold 22K", "Gold 22K (Per 10 Grams)", "per 10 grams"),
+    ("Silver", "Silver (Per Tola)", "per tola"),
+    ("Silver", "Silver (Per 10 Grams)", "per 10 grams"),
+)
+
+
+def get_market_id(client):
     result = client.table("markets").select("id").eq("code", "PSX").execute()
     return result.data[0]["id"] if result.data else None
 
 
-def seed_companies():
-    client = get_supabase_service_client()
-    market_id = get_market_id()
-
-    if not market_id:
-        print("Market not found. Run seed_markets.py first.")
-        return
-
-    bank_sector = client.table("sectors").select("id").eq("market_id", market_id).eq("code", "BANK").execute()
-    bank_sector_id = bank_sector.data[0]["id"] if bank_sector.data else None
-
-    cement_sector = client.table("sectors").select("id").eq("market_id", market_id).eq("code", "CEMENT").execute()
-    cement_sector_id = cement_sector.data[0]["id"] if cement_sector.data else None
-
-    oil_sector = client.table("sectors").select("id").eq("market_id", market_id).eq("code", "OIL").execute()
-    oil_sector_id = oil_sector.data[0]["id"] if oil_sector.data else None
-
-    tech_sector = client.table("sectors").select("id").eq("market_id", market_id).eq("code", "TECH").execute()
-    tech_sector_id = tech_sector.data[0]["id"] if tech_sector.data else None
+def seed_companies(client, market_id: str):
+    sectors = client.table("sectors").select("id, code").eq("market_id", market_id).in_(
+        "code", sorted({code for _, _, code in SAMPLE_COMPANIES})
+    ).execute()
+    sector_map = {s["code"]: s["id"] for s in sectors.data or []}
 
     companies = [
-        {"symbol": "HBL", "name": "Habib Bank Limited", "sector_id": bank_sector_id},
-        {"symbol": "UBL", "name": "United Bank Limited", "sector_id": bank_sector_id},
-        {"symbol": "MCB", "name": "MCB Bank Limited", "sector_id": bank_sector_id},
-        {"symbol": "ABL", "name": "Allied Bank Limited", "sector_id": bank_sector_id},
-        {"symbol": "MEBL", "name": "Meezan Bank Limited", "sector_id": bank_sector_id},
-        {"symbol": "LUCK", "name": "Lucky Cement Limited", "sector_id": cement_sector_id},
-        {"symbol": "DGKC", "name": "D.G. Khan Cement Company Limited", "sector_id": cement_sector_id},
-        {"symbol": "MLCF", "name": "Maple Leaf Cement Factory Limited", "sector_id": cement_sector_id},
-        {"symbol": "OGDC", "name": "Oil & Gas Development Company Limited", "sector_id": oil_sector_id},
-        {"symbol": "PPL", "name": "Pakistan Petroleum Limited", "sector_id": oil_sector_id},
-        {"symbol": "POL", "name": "Pakistan Oilfields Limited", "sector_id": oil_sector_id},
-        {"symbol": "SYS", "name": "Systems Limited", "sector_id": tech_sector_id},
-        {"symbol": "TRG", "name": "TRG Pakistan Limited", "sector_id": tech_sector_id},
+        {
+            "symbol": symbol,
+            "name": name,
+            "sector_id": sector_map.get(code),
+            "market_id": market_id,
+            "is_active": True,
+        }
+        for symbol, name, code in SAMPLE_COMPANIES
     ]
 
-    for company in companies:
-        company["market_id"] = market_id
-        company["is_active"] = True
-
-        existing = client.table("companies").select("id").eq("market_id", market_id).eq("symbol", company["symbol"]).execute()
-        if not existing.data:
-            result = client.table("companies").insert(company).execute()
-            company_id = result.data[0]["id"]
+    # Existing symbols are skipped (ON CONFLICT DO NOTHING); only new rows come back
+    result = client.table("companies").upsert(
+        companies, on_conflict="market_id,symbol", ignore_duplicates=True, default_to_null=False
+    ).execute()
+    created_symbols = {c["symbol"] for c in result.data or []}
 
-            client.table("stocks").insert({
-                "company_id": company_id,
+    if result.data:
+        client.table("stocks").insert([
+            {
+                "company_id": c["id"],
                 "current_price": 100.0,
                 "change_amount": 0,
                 "change_percentage": 0,
                 "volume": 0,
-            }).execute()
+            }
+            for c in result.data
+        ]).execute()
 
+    for company in companies:
+        if company["symbol"] in created_symbols:
             print(f"Created company and stock: {company['name']}")
         else:
             print(f"Company already exists: {company['name']}")
 
 
-def seed_commodities():
-    client = get_supabase_service_client()
-    market_id = get_market_id()
-
-    if not market_id:
-        print("Market not found. Run seed_markets.py first.")
-        return
-
+def seed_commodities(client, market_id: str):
     commodity_types = client.table("commodity_types").select("id, name").execute().data
     type_map = {t["name"]: t["id"] for t in commodity_types}
 
-    commodities = [
-        {"type": "Gold 24K", "name": "Gold 24K (Per Tola)", "price_per_unit": "per tola"},
-        {"type": "Gold 24K", "name": "Gold 24K (Per 10 Grams)", "price_per_unit": "per 10 grams"},
-        {"type": "Gold 22K", "name": "Gold 22K (Per Tola)", "price_per_unit": "per tola"},
-        {"type": "Gold 22K", "name": "Gold 22K (Per 10 Grams)", "price_per_unit": "per 10 grams"},
-        {"type": "Silver", "name": "Silver (Per Tola)", "price_per_unit": "per tola"},
-        {"type": "Silver", "name": "Silver (Per 10 Grams)", "price_per_unit": "per 10 grams"},
+    rows = [
+        {
+            "name": name,
+            "price_per_unit": price_per_unit,
+            "market_id": market_id,
+            "commodity_type_id": type_map[type_name],
+        }
+        for type_name, name, price_per_unit in SAMPLE_COMMODITIES
+        if type_name in type_map
     ]
 
-    for commodity in commodities:
-        type_id = type_map.get(commodity.pop("type"))
-
-        if not type_id:
-            continue
+    result = client.table("commodities").upsert(
+        rows, on_conflict="market_id,commodity_type_id,name", ignore_duplicates=True, default_to_null=False
+    ).execute()
+    created_names = {c["name"] for c in result.data or []}
 
-        commodity["market_id"] = market_id
-        commodity["commodity_type_id"] = type_id
-
-        existing = client.table("commodities").select("id").eq("market_id", market_id).eq("name", commodity["name"]).execute()
-        if not existing.data:
-            client.table("commodities").insert(commodity).execute()
+    for commodity in rows:
+        if commodity["name"] in created_names:
             print(f"Created commodity: {commodity['name']}")
         else:
             print(f"Commodity already exists: {commodity['name']}")
 
 
+async def _pg_seed_companies(conn, market_id: str):
+    """Insert missing companies and their stocks in one transaction."""
+    async with conn.transaction():
+        records = await conn.fetch(
+            """
+            INSERT INTO companies (market_id, sector_id, symbol, name, is_active)
+            SELECT $1::uuid, s.id, u.symbol, u.name, true
+            FROM unnest($2::text[], $3::text[], $4::text[]) AS u(symbol, name, sector_code)
+            LEFT JOIN sectors s ON s.market_id = $1::uuid AND s.code = u.sector_code
+            ON CONFLICT (market_id, symbol) DO NOTHING
+            RETURNING id, symbol
+            """,
+            market_id,
+            *map(list, zip(*SAMPLE_COMPANIES)),
+        )
+        await conn.execute(
+            """
+            INSERT INTO stocks (company_id, current_price, change_amount, change_percentage, volume)
+            SELECT id, 100.0, 0, 0, 0 FROM unnest($1::uuid[]) AS id
+            """,
+            [r["id"] for r in records],
+        )
+
+    created = {r["symbol"] for r in records}
+    for symbol, name, _ in SAMPLE_COMPANIES:
+        if symbol in created:
+            print(f"Created company and stock: {name}")
+        else:
+            print(f"Company already exists: {name}")
+
+
+async def _pg_seed_commodities(conn, market_id: str):
+    records = await conn.fetch(
+        """
+        INSERT INTO commodities (market_id, commodity_type_id, name, price_per_unit)
+        SELECT $1::uuid, t.id, u.name, u.price_per_unit
+        FROM unnest($2::text[], $3::text[], $4::text[]) AS u(type_name, name, price_per_unit)
+        JOIN commodity_types t ON t.name = u.type_name
+        ON CONFLICT (market_id, commodity_type_id, name) DO NOTHING
+        RETURNING name
+        """,
+        market_id,
+        *map(list, zip(*SAMPLE_COMMODITIES)),
+    )
+
+    created = {r["name"] for r in records}
+    for _, name, _ in SAMPLE_COMMODITIES:
+        if name in created:
+            print(f"Created commodity: {name}")
+        else:
+            print(f"Commodity already exists: {name}")
+
+
+async def seed_all(client, market_id: str):
+    # With DATABASE_URL set, each phase is a single SQL statement over a
+    # pooled connection instead of PostgREST requests
+    pool = await get_pool()
+    if pool is None:
+        await asyncio.gather(
+            asyncio.to_thread(seed_companies, client, market_id),
+            asyncio.to_thread(seed_commodities, client, market_id),
+        )
+        return
+
+    async def run(seed):
+        async with pool.acquire() as conn:
+            await seed(conn, market_id)
+
+    try:
+        await asyncio.gather(run(_pg_seed_companies), run(_pg_seed_commodities))
+    finally:
+        await close_pool()
+
+
 def main():
     print("Starting sample data seed...")
+    client = get_supabase_service_client()
+    market_id = get_market_id(client)
 
-    print("\nSeeding companies...")
-    seed_companies()
+    if not market_id:
+        print("Market not found. Run seed_markets.py first.")
+        return
 
-    print("\nSeeding commodities...")
-    seed_commodities()
+    # Companies and commodities don't depend on each other
+    print("\nSeeding companies and commodities...")
+    asyncio.run(seed_all(client, market_id))
 
     print("\nSample data seed completed!")
 
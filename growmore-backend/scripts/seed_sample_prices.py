@@ -34,26 +34,17 @@ def update_stock_prices():
         "TRG": {"price": 145.75, "change": -3.25, "change_pct": -2.18, "volume": 1500000},
     }
 
+    # One set-based UPDATE (scripts/add_sample_price_functions.sql)
+    result = client.rpc("update_stock_prices_bulk", {
+        "payload": [{"symbol": symbol, **data} for symbol, data in stock_prices.items()],
+    }).execute()
+    updated = {row["symbol"] for row in result.data or []}
+
     for symbol, data in stock_prices.items():
-        # Find company
-        company_result = client.table("companies").select("id").eq("symbol", symbol).execute()
-        if not company_result.data:
-            print(f"Company {symbol} not found")
-            continue
-
-        company_id = company_result.data[0]["id"]
-
-        # Update stock
-        stock_result = client.table("stocks").select("id").eq("company_id", company_id).execute()
-        if stock_result.data:
-            client.table("stocks").update({
-                "current_price": data["price"],
-                "change_amount": data["change"],
-                "change_percentage": data["change_pct"],
-                "volume": data["volume"],
-                "last_updated": datetime.utcnow().isoformat(),
-            }).eq("id", stock_result.data[0]["id"]).execute()
+        if symbol in updated:
             print(f"Updated {symbol}: Rs. {data['price']}")
+        else:
+            print(f"Company {symbol} not found")
 
 
 def update_commodity_prices():
@@ -70,15 +61,13 @@ def update_commodity_prices():
         "Silver (Per 10 Grams)": {"price": 2530, "change": 21, "change_pct": 0.84},
     }
 
+    result = client.rpc("update_commodity_prices_bulk", {
+        "payload": [{"name": name, **data} for name, data in commodity_prices.items()],
+    }).execute()
+    updated = {row["name"] for row in result.data or []}
+
     for name, data in commodity_prices.items():
-        result = client.table("commodities").select("id").eq("name", name).execute()
-        if result.data:
-            client.table("commodities").update({
-                "current_price": data["price"],
-                "change_amount": data["change"],
-                "change_percentage": data["change_pct"],
-                "last_updated": datetime.utcnow().isoformat(),
-            }).eq("id", result.data[0]["id"]).execute()
+        if name in updated:
             print(f"Updated {name}: Rs. {data['price']}")
 
 
@@ -137,14 +126,10 @@ def seed_sample_news():
         },
     ]
 
-    for article in articles:
-        # Check if article exists
-        existing = client.table("news_articles").select("id").eq("url", article["url"]).execute()
-        if existing.data:
-            print(f"Article already exists: {article['title'][:30]}...")
-            continue
-
-        client.table("news_articles").insert({
+    # One timestamp for the whole batch
+    now = datetime.utcnow().isoformat()
+    rows = [
+        {
             "source_id": source_id,
             "title": article["title"],
             "summary": article["summary"],
@@ -153,10 +138,22 @@ def seed_sample_news():
             "sentiment_label": article["sentiment_label"],
             "categories": article["categories"],
             "is_processed": True,
-            "published_at": datetime.utcnow().isoformat(),
-            "scraped_at": datetime.utcnow().isoformat(),
-        }).execute()
-        print(f"Added article: {article['title'][:40]}...")
+            "published_at": now,
+            "scraped_at": now,
+        }
+        for article in articles
+    ]
+    # Articles whose url already exists are skipped; only new rows come back
+    result = client.table("news_articles").upsert(
+        rows, on_conflict="url", ignore_duplicates=True, default_to_null=False
+    ).execute()
+    created_urls = {row["url"] for row in result.data or []}
+
+    for article in articles:
+        if article["url"] in created_urls:
+            print(f"Added article: {article['title'][:40]}...")
+        else:
+            print(f"Article already exists: {article['title'][:30]}...")
 
 
 def main():
@@ -1,52 +1,150 @@
+from datetime import datetime
+from types import MappingProxyType, SimpleNamespace
+from uuid import uuid4
+
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 
-@pytest.fixture
-def mock_supabase():
+# The patchers are entered once per session; the per-test fixtures below
+# hand each test a fresh mock through them.
+@pytest.fixture(scope="session")
+def _supabase_patch():
     with patch("app.db.supabase.get_supabase_client") as mock:
-        client = MagicMock()
-        mock.return_value = client
-        yield client
+        yield mock
 
 
-@pytest.fixture
-def mock_firebase():
+@pytest.fixture(scope="session")
+def _firebase_patch():
     with patch("app.config.firebase.get_firebase_app") as mock:
-        mock.return_value = MagicMock()
         yield mock
 
 
 @pytest.fixture
-def mock_openai():
+def mock_supabase(_supabase_patch):
+    client = MagicMock()
+    _supabase_patch.return_value = client
+    return client
+
+
+@pytest.fixture
+def mock_firebase(_firebase_patch):
+    _firebase_patch.reset_mock()
+    _firebase_patch.return_value = MagicMock()
+    return _firebase_patch
+
+
+@pytest.fixture(scope="session")
+def _openai_patch():
     with patch("app.ai.openai_client.get_openai_client") as mock:
-        client = MagicMock()
-        mock.return_value = client
-        yield client
+        yield mock
+
+
+@pytest.fixture
+def mock_openai(_openai_patch):
+    client = MagicMock()
+    _openai_patch.return_value = client
+    return client
+
+
+@pytest.fixture
+def openai_mock(request, mock_openai):
+    """mock_openai whose complete_json returns the indirect parametrize value."""
+    mock_openai.complete_json = AsyncMock(return_value=request.param)
+    return mock_openai
 
 
 # Backwards-compat alias for any test that still uses mock_groq
 mock_groq = mock_openai
 
 
+class _QueryStub:
+    """Stands in for a PostgREST query builder: every builder call returns self."""
+
+    def __init__(self, result):
+        self._result = result
+
+    def __getattr__(self, name):
+        return self._chain
+
+    def _chain(self, *args, **kwargs):
+        return self
+
+    def execute(self):
+        return self._result
+
+
 @pytest.fixture
-def client(mock_supabase, mock_firebase):
+def stub_execute(mock_supabase):
+    """Make every mock_supabase.table(...) chain end in the same execute() result."""
+    def stub(data, count=None):
+        result = SimpleNamespace(data=data, count=count)
+        mock_supabase.table.return_value = _QueryStub(result)
+        return result
+
+    return stub
+
+
+@pytest.fixture(scope="session")
+def _app_client(_supabase_patch, _firebase_patch):
     from app.main import app
     return TestClient(app)
 
 
+@pytest.fixture
+def client(_app_client, mock_supabase, mock_firebase):
+    # Endpoints get the DB through get_db; hand them this test's mock directly
+    # rather than relying on import order relative to the patch
+    from app.core.dependencies import get_db
+
+    overrides = _app_client.app.dependency_overrides
+    overrides[get_db] = lambda: mock_supabase
+    yield _app_client
+    overrides.pop(get_db, None)
+
+
 @pytest.fixture
 def auth_headers():
     return {"Authorization": "Bearer test_token"}
 
 
+_MARKET_TEMPLATE = {
+    "code": "PSX",
+    "name": "Pakistan Stock Exchange",
+    "country": "Pakistan",
+    "country_code": "PK",
+    "currency": "PKR",
+    "currency_symbol": "Rs",
+    "timezone": "Asia/Karachi",
+    "is_active": True,
+}
+
+_STOCK_TEMPLATE = {
+    "current_price": 100.50,
+    "change_amount": 2.50,
+    "change_percentage": 2.55,
+    "volume": 1000000,
+    "market_cap": 50000000000,
+}
+
+_NEWS_ARTICLE_TEMPLATE = {
+    "title": "Test News Article",
+    "slug": "test-news-article",
+    "summary": "This is a test news article summary.",
+    "url": "https://example.com/test-article",
+    "sentiment_score": 0.5,
+    "sentiment_label": "positive",
+    "impact_score": 0.7,
+    "is_processed": True,
+}
+
+
 @pytest.fixture
 def mock_current_user():
     from app.models.user import User
-    from uuid import uuid4
-    from datetime import datetime
 
+    now = datetime.utcnow()
     return User(
         id=uuid4(),
         firebase_uid="test_firebase_uid",
@@ -54,67 +152,44 @@ def mock_current_user():
         display_name="Test User",
         auth_provider="email",
         is_active=True,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow(),
+        created_at=now,
+        updated_at=now,
     )
 
 
 @pytest.fixture
 def sample_market():
-    from uuid import uuid4
-    from datetime import datetime
-
+    now = datetime.utcnow().isoformat()
     return {
+        **_MARKET_TEMPLATE,
         "id": str(uuid4()),
-        "code": "PSX",
-        "name": "Pakistan Stock Exchange",
-        "country": "Pakistan",
-        "country_code": "PK",
-        "currency": "PKR",
-        "currency_symbol": "Rs",
-        "timezone": "Asia/Karachi",
-        "is_active": True,
-        "created_at": datetime.utcnow().isoformat(),
-        "updated_at": datetime.utcnow().isoformat(),
+        "created_at": now,
+        "updated_at": now,
     }
 
 
-@pytest.fixture
+# Read-only and built once: a test that tries to mutate a sample fails loudly
+@pytest.fixture(scope="session")
 def sample_stock():
-    from uuid import uuid4
-    from datetime import datetime
-
-    return {
+    now = datetime.utcnow().isoformat()
+    return MappingProxyType({
+        **_STOCK_TEMPLATE,
         "id": str(uuid4()),
         "company_id": str(uuid4()),
-        "current_price": 100.50,
-        "change_amount": 2.50,
-        "change_percentage": 2.55,
-        "volume": 1000000,
-        "market_cap": 50000000000,
-        "last_updated": datetime.utcnow().isoformat(),
-        "created_at": datetime.utcnow().isoformat(),
-    }
+        "last_updated": now,
+        "created_at": now,
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_news_article():
-    from uuid import uuid4
-    from datetime import datetime
-
-    return {
+    now = datetime.utcnow().isoformat()
+    return MappingProxyType({
+        **_NEWS_ARTICLE_TEMPLATE,
         "id": str(uuid4()),
         "source_id": str(uuid4()),
-        "title": "Test News Article",
-        "slug": "test-news-article",
-        "summary": "This is a test news article summary.",
-        "url": "https://example.com/test-article",
-        "published_at": datetime.utcnow().isoformat(),
-        "sentiment_score": 0.5,
-        "sentiment_label": "positive",
-        "impact_score": 0.7,
-        "categories": ["stocks", "economy"],
-        "tags": ["test", "article"],
-        "is_processed": True,
-        "created_at": datetime.utcnow().isoformat(),
-    }
+        "published_at": now,
+        "categories": ("stocks", "economy"),
+        "tags": ("test", "article"),
+        "created_at": now,
+    })
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 
 
+@pytest.mark.integration
 class TestAuthEndpoints:
     def test_verify_token_success(self, client, mock_supabase):
         with patch("app.core.security.verify_firebase_token", new_callable=AsyncMock) as mock_verify:
@@ -54,7 +55,6 @@ class TestAuthEndpoints:
 
 
 class TestTokenVerification:
-    @pytest.mark.asyncio
     async def test_verify_valid_token(self):
         with patch("firebase_admin.auth.verify_id_token") as mock_verify:
             mock_verify.return_value = {
@@ -67,7 +67,6 @@ class TestTokenVerification:
                 result = await verify_firebase_token("valid_token")
                 assert "uid" in result or result is not None
 
-    @pytest.mark.asyncio
     async def test_extract_auth_provider(self):
         from app.core.security import _get_auth_provider
 
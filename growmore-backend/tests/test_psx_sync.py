@@ -0,0 +1,64 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+def make_sync_service():
+    from app.services.psx.sync_service import PSXSyncService
+
+    with patch.multiple(
+        "app.services.psx.sync_service",
+        PSXTerminalClient=MagicMock(),
+        DPSPortalClient=MagicMock(),
+        PSXDataWriter=MagicMock(),
+    ):
+        service = PSXSyncService()
+    service._initialized = True
+    return service
+
+
+class TestTickPriceWrites:
+    async def test_intraday_movers_go_out_in_one_batch(self):
+        service = make_sync_service()
+        service.psx_client.get_market_stats = AsyncMock(return_value={
+            "topGainers": [{"symbol": "HBL", "price": 150.5, "changePercent": 2.1}],
+            "topLosers": [
+                {"symbol": "OGDC", "price": 98.0, "changePercent": -1.4},
+                {"symbol": "UNKNOWN", "price": 1.0},
+            ],
+        })
+        ids = {"HBL": ("company-hbl", "stock-hbl"), "OGDC": ("company-ogdc", "stock-ogdc")}
+        service.data_writer.get_ids.side_effect = ids.get
+        service.data_writer.batch_update_stock_prices.return_value = 2
+
+        result = await service.sync_intraday()
+
+        service.data_writer.update_stock_price.assert_not_called()
+        (rows,), _ = service.data_writer.batch_update_stock_prices.call_args
+        assert [(row["id"], row["company_id"], row["current_price"]) for row in rows] == [
+            ("stock-hbl", "company-hbl", 150.5),
+            ("stock-ogdc", "company-ogdc", 98.0),
+        ]
+        assert result.symbols_found == 3
+        assert result.stocks_updated == 2
+
+    def test_batch_update_groups_rows_by_columns(self, mock_supabase):
+        from app.services.psx.data_writer import PSXDataWriter
+
+        with patch("app.services.psx.data_writer.get_supabase_service_client", return_value=mock_supabase):
+            writer = PSXDataWriter()
+        upsert = mock_supabase.table.return_value.upsert
+
+        count = writer.batch_update_stock_prices([
+            {"id": "s1", "company_id": "c1", "current_price": 10.0},
+            {"id": "s2", "company_id": "c2", "current_price": 20.0, "volume": 500},
+            {"id": "s3", "company_id": "c3", "current_price": 30.0},
+        ])
+
+        assert count == 3
+        assert [call.args[0] for call in upsert.call_args_list] == [
+            [
+                {"id": "s1", "company_id": "c1", "current_price": 10.0},
+                {"id": "s3", "company_id": "c3", "current_price": 30.0},
+            ],
+            [{"id": "s2", "company_id": "c2", "current_price": 20.0, "volume": 500}],
+        ]
+        mock_supabase.rpc.assert_called_once_with("refresh_stock_movers")
@@ -0,0 +1,143 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from decimal import Decimal
+
+from app.utils.formatters import (
+    format_market_cap,
+    format_number,
+    format_number_batch,
+    format_percentage,
+    format_price_change,
+)
+from app.utils.helpers import (
+    chunks,
+    clean_html,
+    flatten,
+    ichunks,
+    parse_datetime,
+    remove_duplicates,
+    retry_async,
+    safe_decimal,
+)
+from app.utils.validators import (
+    sanitize_string,
+    validate_email,
+    validate_phone_pakistan,
+    validate_url,
+    validate_uuid,
+)
+
+
+class TestFormatters:
+    def test_format_number_suffixes(self):
+        assert format_number(1_500) == "1.50K"
+        assert format_number(2_500_000, decimal_places=1) == "2.5M"
+        assert format_number(-3_000_000_000) == "-3.00B"
+        assert format_number(4_000_000_000_000) == "4.00T"
+        assert format_number(999.5) == "999.50"
+        assert format_number(12_345, use_suffix=False) == "12,345.00"
+        assert format_number(None) == ""
+
+    def test_format_number_batch_matches_scalar(self):
+        values = [1_500, -2_500_000, 999.5, 0, None, "bad", Decimal("4000000000000")]
+        assert format_number_batch(values) == [format_number(v) for v in values]
+        assert format_number_batch([2_500_000], decimal_places=1) == ["2.5M"]
+
+    def test_format_market_cap(self):
+        assert format_market_cap(Decimal("50000000000")) == "Rs 50.00B"
+        assert format_market_cap(500) == "Rs 500.00"
+        assert format_market_cap(None) == ""
+
+    def test_format_percentage_sign(self):
+        assert format_percentage(2.5) == "+2.50%"
+        assert format_percentage(-2.5) == "-2.50%"
+        assert format_percentage(0) == "0.00%"
+        assert format_percentage(2.5, include_sign=False) == "2.50%"
+
+    def test_format_price_change(self):
+        assert format_price_change(2.5, 1.25) == "+Rs 2.50 (+1.25%)"
+        assert format_price_change(Decimal("-3")) == "-Rs 3.00"
+        assert format_price_change(0, 0) == "Rs 0.00 (0.00%)"
+
+
+class TestValidators:
+    def test_sanitize_string(self):
+        assert sanitize_string(' <b>"Hello"</b>\n  world\'s ') == "bHello/b worlds"
+        assert sanitize_string("abc   def", max_length=4) == "abc"
+        assert sanitize_string(None) == ""
+
+    def test_validate_uuid(self):
+        assert validate_uuid("12345678-1234-5678-1234-567812345678")
+        assert validate_uuid("{12345678-1234-5678-1234-567812345678}")
+        assert validate_uuid("12345678123456781234567812345678")
+        assert not validate_uuid("12345678-1234-5678-1234-56781234567")
+        assert not validate_uuid(None)
+
+    def test_validate_email(self):
+        assert validate_email("user.name+tag@example.com.pk")
+        assert not validate_email("user@example")
+        assert not validate_email("user@example.com\n")
+        assert not validate_email("a" * 250 + "@x.com")
+
+    def test_validate_url(self):
+        assert validate_url("https://dps.psx.com.pk/company/HBL")
+        assert not validate_url("ftp://example.com")
+        assert not validate_url("https://example.com/" + "a" * 2048)
+
+    def test_validate_phone_pakistan(self):
+        for phone in ["+923001234567", "923001234567", "03001234567", "3001234567", "0300-123 (4567)"]:
+            assert validate_phone_pakistan(phone)
+        for phone in ["", "+3001234567", "030012345", "+9203001234567", "0300abc4567"]:
+            assert not validate_phone_pakistan(phone)
+
+
+class TestHelpers:
+    def test_parse_datetime_formats(self):
+        assert parse_datetime("2024-01-05T10:11:12.5Z") == datetime(2024, 1, 5, 10, 11, 12, 500000)
+        assert parse_datetime("2024-1-5") == datetime(2024, 1, 5)
+        assert parse_datetime("5 Jan 2024") == datetime(2024, 1, 5)
+        assert parse_datetime("January 5, 2024") == datetime(2024, 1, 5)
+        assert parse_datetime("05-01-2024") == datetime(2024, 1, 5)
+        assert parse_datetime("12/31/2024") == datetime(2024, 12, 31)
+        assert parse_datetime("2024-02-30") is None
+        assert parse_datetime("2024-01-05 10:11:12") is None
+        assert parse_datetime("05.01.2024", formats=["%d.%m.%Y"]) == datetime(2024, 1, 5)
+
+    def test_clean_html(self):
+        assert clean_html("<p>Rates <b>held</b>\n\n at <i>22%</i> </p>") == "Rates held at 22%"
+        assert clean_html('a<a href="x y">b</a>c') == "abc"
+        assert clean_html("1 < 2") == "1 < 2"
+
+    def test_safe_decimal(self):
+        assert safe_decimal(42) == Decimal(42)
+        assert safe_decimal(0.1) == Decimal("0.1")
+        assert safe_decimal(" 1,234.50 ") == Decimal("1234.50")
+        assert safe_decimal("n/a", default=Decimal(0)) == Decimal(0)
+        assert safe_decimal(None) is None
+
+    def test_chunks_and_flatten(self):
+        assert chunks([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+        assert list(ichunks(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+        assert flatten([[1, 2], [], [3]]) == [1, 2, 3]
+
+    def test_remove_duplicates_keeps_first_occurrence(self):
+        assert remove_duplicates([3, 1, 3, 2, 1]) == [3, 1, 2]
+        rows = [{"id": 1, "v": "a"}, {"id": 2, "v": "b"}, {"id": 1, "v": "c"}]
+        assert remove_duplicates(rows, key=lambda r: r["id"]) == rows[:2]
+
+    async def test_retry_async_caps_delay(self):
+        calls = []
+
+        @retry_async(max_retries=5, delay=10, backoff=10, max_delay=25, jitter=0)
+        async def flaky():
+            calls.append(1)
+            raise ValueError("down")
+
+        with patch("app.utils.helpers.asyncio.sleep", new=AsyncMock()) as sleep:
+            with pytest.raises(ValueError):
+                await flaky()
+
+        assert len(calls) == 5
+        assert [c.args[0] for c in sleep.await_args_list] == [10, 25, 25, 25]
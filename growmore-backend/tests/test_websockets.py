@@ -0,0 +1,70 @@
+from app.websockets.connection_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        self.sent.append(data)
+
+
+class TestConnectionManager:
+    async def test_topic_broadcast_follows_subscriptions(self):
+        manager = ConnectionManager()
+        first, second, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+
+        await manager.connect(first, "user-1")
+        manager.subscribe("user-1", "news")
+        await manager.connect(second, "user-1")  # inherits the news subscription
+        await manager.connect(other, "user-2")
+
+        await manager.broadcast_to_topic({"type": "news"}, "news")
+        assert first.sent == second.sent == ['{"type":"news"}']
+        assert other.sent == []
+
+        manager.unsubscribe("user-1", "news")
+        await manager.broadcast_to_topic({"type": "news"}, "news")
+        assert len(first.sent) == 1
+
+    async def test_disconnect_cleans_up(self):
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+
+        await manager.connect(websocket, "user-1")
+        manager.disconnect(websocket, "user-1")
+
+        assert manager.active_connections == {}
+        assert manager.connection_info == {}
+        assert all(not conns for conns in manager.topic_connections.values())
+        assert "user-1" not in manager.subscriptions["alerts"]
+
+    def test_has_price_subscribers_prunes_symbols(self):
+        manager = ConnectionManager()
+        assert not manager.has_price_subscribers()
+
+        manager.subscribe("user-1", "prices_by_symbol", symbols=["HBL"])
+        assert manager.has_price_subscribers()
+
+        manager.unsubscribe("user-1", symbols=["HBL"])
+        assert manager.symbol_subscriptions == {}
+        assert not manager.has_price_subscribers()
+
+    async def test_symbol_batch_sends_one_message_per_connection(self):
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+
+        await manager.connect(websocket, "user-1")
+        manager.subscribe("user-1", "prices_by_symbol", symbols=["HBL", "OGDC"])
+
+        await manager.broadcast_symbol_batch(
+            {"HBL": {"symbol": "HBL"}, "OGDC": {"symbol": "OGDC"}, "UBL": {"symbol": "UBL"}},
+            {"type": "price_update"},
+        )
+
+        assert websocket.sent == [
+            '{"type":"price_update","data":[{"symbol":"HBL"},{"symbol":"OGDC"}]}'
+        ]
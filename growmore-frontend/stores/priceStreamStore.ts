@@ -58,14 +58,19 @@ export const usePriceStreamStore = create<PriceStreamState>((set, get) => ({
           const message: WebSocketServerMessage = JSON.parse(event.data);
 
           if (message.type === 'price_update' && message.data) {
-            const priceUpdate = message.data as PriceUpdateData;
-            get().updatePrice(priceUpdate.symbol, {
-              symbol: priceUpdate.symbol,
-              price: priceUpdate.price,
-              change: priceUpdate.change,
-              change_percent: priceUpdate.change_percent,
-              volume: priceUpdate.volume,
-              timestamp: priceUpdate.timestamp,
+            // Batched updates arrive as an array, single updates as an object
+            const priceUpdates: PriceUpdateData[] = Array.isArray(message.data)
+              ? message.data
+              : [message.data];
+            priceUpdates.forEach((priceUpdate) => {
+              get().updatePrice(priceUpdate.symbol, {
+                symbol: priceUpdate.symbol,
+                price: priceUpdate.price,
+                change: priceUpdate.change,
+                change_percent: priceUpdate.change_percent,
+                volume: priceUpdate.volume,
+                timestamp: priceUpdate.timestamp,
+              });
             });
           }
         } catch (error) {